@@ -244,8 +244,7 @@ def identifiers_gen(out, filename):
     keys = of_g.identifiers_by_group.keys()
     keys.sort()
     for group in keys:
-        idents = of_g.identifiers_by_group[group]
-        idents.sort()
+        idents = sorted(of_g.identifiers_by_group[group])
         out.write("""
 /****************************************************************
  * Identifiers from %s
@@ -302,7 +301,7 @@ def identifiers_gen(out, filename):
     OF_VALUE_BY_VERSION(version, %(val_str)s)
 """ % dict(ident=ident, val_str=", ".join(val_list)))
             if flags.ident_is_flag(ident):
-                log("Treating %s as a flag" % ident)
+                verbose("Treating %s as a flag", ident)
                 out.write("""
 #define %(ident)s_SET(flags, version)     \\
     OF_FLAG_SET(flags, %(ident)s_BY_VERSION(version))
@@ -316,7 +315,7 @@ def identifiers_gen(out, filename):
                       % dict(ident=ident, count=count))
             count += 1 # This count should probably be promoted higher
 
-    log("Generated %d identifiers" % (count - 1))
+    log("Generated %d identifiers", count - 1)
     out.write("\n#endif /* Loci identifiers header file */\n")
 
 def base_h_external(out, filename):
@@ -1249,21 +1248,22 @@ extern const char *const of_object_id_str[];
 
     # Generate object type range checking for inheritance classes
 
-    # @fixme These should be determined algorithmicly
     out.write("""
 /*
  * Macros to check if an object ID is within an inheritance class range
  */
 """)
     # Alphabetical order for 'last'
-    last_ids = dict(of_action="OF_ACTION_STRIP_VLAN",
-                    of_oxm="OF_OXM_VLAN_VID_MASKED",
-                    of_instruction="OF_INSTRUCTION_WRITE_METADATA",
-                    of_queue_prop="OF_QUEUE_PROP_MIN_RATE",
-                    of_table_feature_prop="OF_TABLE_FEATURE_PROP_WRITE_SETFIELD_MISS",
+    last_ids = dict(of_action=inheritance_last_id("of_action"),
+                    of_oxm=inheritance_last_id("of_oxm"),
+                    of_instruction=inheritance_last_id("of_instruction"),
+                    of_queue_prop=inheritance_last_id("of_queue_prop"),
+                    of_table_feature_prop=inheritance_last_id("of_table_feature_prop"),
                     # @FIXME add meter_band ?
                     )
     for cls, last in last_ids.items():
+        if cls not in of_g.unified:
+            continue
         out.write("""
 #define %(enum)s_FIRST_ID      (%(enum)s + 1)
 #define %(enum)s_LAST_ID       %(last)s
@@ -1285,16 +1285,16 @@ extern const char *const of_object_id_str[];
 static inline int
 of_wire_id_valid(int object_id, int base_object_id) {
     switch (base_object_id) {
-    case OF_ACTION:
-        return OF_ACTION_VALID_ID(object_id);
-    case OF_OXM:
-        return OF_OXM_VALID_ID(object_id);
-    case OF_QUEUE_PROP:
-        return OF_QUEUE_PROP_VALID_ID(object_id);
-    case OF_TABLE_FEATURE_PROP:
-        return OF_TABLE_FEATURE_PROP_VALID_ID(object_id);
-    case OF_INSTRUCTION:
-        return OF_INSTRUCTION_VALID_ID(object_id);
+""")
+    for cls in ["of_action", "of_oxm", "of_queue_prop",
+                "of_table_feature_prop", "of_instruction"]:
+        if cls not in of_g.unified:
+            continue
+        out.write("""\
+    case %(enum)s:
+        return %(enum)s_VALID_ID(object_id);
+""" % dict(enum=enum_name(cls)))
+    out.write("""\
     default:
         break;
     }
@@ -1302,6 +1302,20 @@ of_wire_id_valid(int object_id, int base_object_id) {
 }
 """)
 
+def inheritance_last_id(parent):
+    """
+    Return the enum of the alphabetically last subclass of parent
+
+    If the parent has no subclasses, its own enum is returned, which
+    makes the range of valid subclass IDs empty.
+    """
+    subclasses = [cls for cls in of_g.unified
+                  if cls in of_g.class_info and
+                  of_g.class_info[cls]["parent"] == parent]
+    if not subclasses:
+        return enum_name(parent)
+    return enum_name(max(subclasses))
+
 def gen_object_enum_str(out):
     out.write("\nconst char *const of_object_id_str[] = {\n")
     out.write("    \"of_object\",\n")
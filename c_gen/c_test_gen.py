@@ -739,6 +739,16 @@ list_setup_%(cls)s_%(v_name)s(
     sub_classes =  type_maps.sub_class_map(base_type, version)
     v_name = loxi_utils.version_to_name(version)
 
+    if len(sub_classes) == 0 and base_type in type_maps.inheritance_map:
+        # All subclasses were excluded from generation; leave the list empty
+        out.write("""
+    /* No subclasses of %s are generated */
+
+    return value;
+}
+""" % base_type)
+        return
+
     if len(sub_classes) == 0:
         out.write("    /* No subclasses for %s */\n"% base_type)
         out.write("    %s_t *elt_p;\n" % base_type)
@@ -786,6 +796,17 @@ list_check_%(cls)s_%(v_name)s(
     sub_classes =  type_maps.sub_class_map(base_type, version)
     v_name = loxi_utils.version_to_name(version)
 
+    if len(sub_classes) == 0 and base_type in type_maps.inheritance_map:
+        # All subclasses were excluded from generation; the list is empty
+        out.write("""
+    /* No subclasses of %(base_type)s are generated */
+    TEST_ASSERT(%(cls)s_first(list, &elt) == OF_ERROR_RANGE);
+
+    return value;
+}
+""" % dict(cls=cls, base_type=base_type))
+        return
+
     if len(sub_classes) == 0:
         out.write("    /* No subclasses for %s */\n"% base_type)
         out.write("    %s_t *elt_p;\n" % base_type)
@@ -1182,7 +1203,10 @@ int
 #     TEST_OK(%(base_type)s_init(&elt, %(v_name)s, -1, 1));
 # """ % dict(base_type=base_type, v_name=loxi_utils.version_to_name(version)))
 
-    if len(sub_classes) == 0: # No inheritance case
+    if len(sub_classes) == 0 and base_type in type_maps.inheritance_map:
+        # All subclasses were excluded from generation; leave the list empty
+        out.write("    /* No subclasses of %s are generated */\n" % base_type)
+    elif len(sub_classes) == 0: # No inheritance case
         inst_len = loxi_utils.base_type_to_length(base_type, version)
         setup_instance(out, cls, base_type, "elt_p", v_name, inst_len, version)
     else:
@@ -1218,7 +1242,11 @@ int
     sub_classes =  type_maps.sub_class_map(base_type, version)
     v_name = loxi_utils.version_to_name(version)
 
-    if len(sub_classes) == 0:
+    if len(sub_classes) == 0 and base_type in type_maps.inheritance_map:
+        # All subclasses were excluded from generation; the list is empty
+        entry_count = 0
+        out.write("    /* No subclasses of %s are generated */\n" % base_type)
+    elif len(sub_classes) == 0:
         entry_count = 2
         out.write("    /* No subclasses for %s */\n"% base_type)
         out.write("    %s_t *elt_p;\n" % base_type)
@@ -1232,8 +1260,10 @@ int
         for instance, subcls in sub_classes:
             out.write("    %s = &elt.%s;\n" % (instance, instance))
 
-    out.write("    TEST_OK(%(cls)s_first(list, &elt));\n" % dict(cls=cls))
-    if len(sub_classes) == 0: # No inheritance case
+    if entry_count == 0:
+        pass
+    elif len(sub_classes) == 0: # No inheritance case
+        out.write("    TEST_OK(%(cls)s_first(list, &elt));\n" % dict(cls=cls))
         if loxi_utils.class_is_var_len(base_type, version):
             inst_len = -1
         else:
@@ -1241,6 +1271,7 @@ int
         check_instance(out, cls, base_type, "elt_p", v_name, inst_len,
                        version, True)
     else:
+        out.write("    TEST_OK(%(cls)s_first(list, &elt));\n" % dict(cls=cls))
         count = 0
         for instance, subcls in sub_classes:
             count += 1
@@ -1929,7 +1960,7 @@ test_ident_macros(void)
 
 """)
 
-    for ident, info in of_g.identifiers.items():
+    for ident, info in sorted(of_g.identifiers.items()):
         if not identifiers.defined_versions_agree(of_g.identifiers,
                                                   of_g.target_version_list,
                                                   ident):
@@ -195,6 +195,11 @@ def gen_type_to_object_id(out, type_str, prefix, template,
             else:
                 v = type_maps.invalid_type
 
+            # The class may have been excluded from generation
+            if v != type_maps.invalid_type and \
+                    (template % v.upper()).lower() not in of_g.unified:
+                v = type_maps.invalid_type
+
             if v == type_maps.invalid_type:
                 out.write("    %-30s /* %d (Invalid) */\n" %
                           ("OF_OBJECT_INVALID" + comma, i))
@@ -710,8 +715,14 @@ of_object_to_stats_type(of_object_id_t id, of_version_t version)
             stats_names[name] = value
 
     for name, value in stats_names.items():
-        out.write("    case OF_%s_STATS_REPLY:\n" % name.upper())
-        out.write("    case OF_%s_STATS_REQUEST:\n" % name.upper())
+        # Stats classes may have been excluded from generation
+        classes = [cls for cls in ["of_%s_stats_reply" % name,
+                                   "of_%s_stats_request" % name]
+                   if cls in of_g.unified]
+        if not classes:
+            continue
+        for cls in classes:
+            out.write("    case %s:\n" % cls.upper())
         for version in of_g.of_version_range:
             if not name in type_maps.stats_types[version]:
                 out.write("        if (version == %s) break;\n" %
@@ -921,7 +932,7 @@ def gen_type_data_header(out):
  * Special case length functions for objects with
  */
 """)
-    for ((cls, name), prev) in of_g.special_offsets.items():
+    for ((cls, name), prev) in sorted(of_g.special_offsets.items()):
         s_cls = cls[3:] # take off of_
         out.write("""
 /**
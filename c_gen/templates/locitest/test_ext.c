@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 /* Copyright 2012, Big Switch Networks, Inc. */
 
 /**
@@ -40,11 +41,13 @@
 int
 test_ext_objs(void)
 {
+:: if "of_action_bsn_mirror" in of_g.unified:
     of_action_bsn_mirror_t *obj;
 
     obj = of_action_bsn_mirror_new(OF_VERSION_1_0);
     TEST_ASSERT(obj != NULL);
     TEST_ASSERT(obj->object_id == OF_ACTION_BSN_MIRROR);
+:: #endif
 
     TEST_ASSERT(of_action_to_object_id(OF_EXPERIMENTER_TYPE, OF_VERSION_1_0) ==
                 OF_ACTION_EXPERIMENTER);
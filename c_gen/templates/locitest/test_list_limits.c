@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 /* Copyright 2013, Big Switch Networks, Inc. */
 
 /**
@@ -34,6 +35,7 @@
 
 #include <locitest/test_common.h>
 
+:: if "of_flow_stats_reply" in of_g.unified and "of_list_flow_stats_entry" in of_g.unified:
 static int
 test_list_limits(void)
 {
@@ -89,12 +91,15 @@ test_list_limits_bind(void)
     of_flow_stats_reply_delete(obj);
     return TEST_PASS;
 }
+:: #endif
 
 int
 run_list_limits_tests(void)
 {
+:: if "of_flow_stats_reply" in of_g.unified and "of_list_flow_stats_entry" in of_g.unified:
     RUN_TEST(list_limits);
     RUN_TEST(list_limits_bind);
+:: #endif
 
     return TEST_PASS;
 }
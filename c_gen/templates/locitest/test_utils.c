@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 /* Copyright 2013, Big Switch Networks, Inc. */
 
 /**
@@ -36,6 +37,7 @@
 #include <locitest/test_common.h>
 #include <loci/of_utils.h>
 
+:: if "of_action_set_dl_src" in of_g.unified:
 /**
  * Test has output port utility function
  */
@@ -117,11 +119,14 @@ test_has_outport(void)
 
     return TEST_PASS;
 }
+:: #endif
 
 int
 run_utility_tests(void)
 {
+:: if "of_action_set_dl_src" in of_g.unified:
     RUN_TEST(has_outport);
+:: #endif
     RUN_TEST(dump_objs);
 
     return TEST_PASS;
@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 /* Copyright 2013, Big Switch Networks, Inc. */
 
 /**
@@ -38,6 +39,7 @@
 #include <locitest/test_common.h>
 #include <loci/loci_validator.h>
 
+:: if "of_table_stats_request" in of_g.unified:
 static int
 test_validate_fixed_length(void)
 {
@@ -52,7 +54,9 @@ test_validate_fixed_length(void)
     of_table_stats_request_delete(obj);
     return TEST_PASS;
 }
+:: #endif
 
+:: if "of_table_stats_reply" in of_g.unified and "of_table_stats_entry" in of_g.unified and "of_list_table_stats_entry" in of_g.unified:
 static int
 test_validate_fixed_length_list(void)
 {
@@ -74,7 +78,9 @@ test_validate_fixed_length_list(void)
     of_table_stats_reply_delete(obj);
     return TEST_PASS;
 }
+:: #endif
 
+:: if "of_list_action" in of_g.unified and "of_action_set_tp_dst" in of_g.unified and "of_action_output" in of_g.unified:
 static int
 test_validate_tlv16_list(void)
 {
@@ -101,13 +107,20 @@ test_validate_tlv16_list(void)
     of_flow_modify_delete(obj);
     return TEST_PASS;
 }
+:: #endif
 
 int
 run_validator_tests(void)
 {
+:: if "of_table_stats_request" in of_g.unified:
     RUN_TEST(validate_fixed_length);
+:: #endif
+:: if "of_table_stats_reply" in of_g.unified and "of_table_stats_entry" in of_g.unified and "of_list_table_stats_entry" in of_g.unified:
     RUN_TEST(validate_fixed_length_list);
+:: #endif
+:: if "of_list_action" in of_g.unified and "of_action_set_tp_dst" in of_g.unified and "of_action_output" in of_g.unified:
     RUN_TEST(validate_tlv16_list);
+:: #endif
 
     return TEST_PASS;
 }
@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 /* Copyright 2013, Big Switch Networks, Inc. */
 
 /****************************************************************
@@ -189,8 +190,12 @@ extension_action_object_id_get(of_object_t *obj, of_object_id_t *id)
         uint32_t subtype;
         buf_u32_get(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, &subtype);
         switch (subtype) {
+:: if "of_action_bsn_mirror" in of_g.unified:
         case 1: *id = OF_ACTION_BSN_MIRROR; break;
+:: #endif
+:: if "of_action_bsn_set_tunnel_dst" in of_g.unified:
         case 2: *id = OF_ACTION_BSN_SET_TUNNEL_DST; break;
+:: #endif
         }
         break;
     }
@@ -198,7 +203,9 @@ extension_action_object_id_get(of_object_t *obj, of_object_id_t *id)
         uint16_t subtype;
         buf_u16_get(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, &subtype);
         switch (subtype) {
+:: if "of_action_nicira_dec_ttl" in of_g.unified:
         case 18: *id = OF_ACTION_NICIRA_DEC_TTL; break;
+:: #endif
         }
         break;
     }
@@ -217,24 +224,42 @@ of_extension_object_id_set(of_object_t *obj, of_object_id_t id)
     uint8_t *buf = OF_OBJECT_BUFFER_INDEX(obj, 0);
     
     switch (id) {
+:: if "of_action_bsn_mirror" in of_g.unified or "of_action_id_bsn_mirror" in of_g.unified:
+::     if "of_action_bsn_mirror" in of_g.unified:
     case OF_ACTION_BSN_MIRROR:
+::     #endif
+::     if "of_action_id_bsn_mirror" in of_g.unified:
     case OF_ACTION_ID_BSN_MIRROR:
+::     #endif
         buf_u32_set(buf + OF_ACTION_EXPERIMENTER_ID_OFFSET,
                     OF_EXPERIMENTER_ID_BSN);
         buf_u32_set(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, 1);
         break;
+:: #endif
+:: if "of_action_bsn_set_tunnel_dst" in of_g.unified or "of_action_id_bsn_set_tunnel_dst" in of_g.unified:
+::     if "of_action_bsn_set_tunnel_dst" in of_g.unified:
     case OF_ACTION_BSN_SET_TUNNEL_DST:
+::     #endif
+::     if "of_action_id_bsn_set_tunnel_dst" in of_g.unified:
     case OF_ACTION_ID_BSN_SET_TUNNEL_DST:
+::     #endif
         buf_u32_set(buf + OF_ACTION_EXPERIMENTER_ID_OFFSET,
                     OF_EXPERIMENTER_ID_BSN);
         buf_u32_set(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, 2);
         break;
+:: #endif
+:: if "of_action_nicira_dec_ttl" in of_g.unified or "of_action_id_nicira_dec_ttl" in of_g.unified:
+::     if "of_action_nicira_dec_ttl" in of_g.unified:
     case OF_ACTION_NICIRA_DEC_TTL:
+::     #endif
+::     if "of_action_id_nicira_dec_ttl" in of_g.unified:
     case OF_ACTION_ID_NICIRA_DEC_TTL:
+::     #endif
         buf_u32_set(buf + OF_ACTION_EXPERIMENTER_ID_OFFSET,
                     OF_EXPERIMENTER_ID_NICIRA);
         buf_u16_set(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, 18);
         break;
+:: #endif
     default:
         break;
     }
@@ -266,8 +291,12 @@ extension_action_id_object_id_get(of_object_t *obj, of_object_id_t *id)
         uint32_t subtype;
         buf_u32_get(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, &subtype);
         switch (subtype) {
+:: if "of_action_id_bsn_mirror" in of_g.unified:
         case 1: *id = OF_ACTION_ID_BSN_MIRROR; break;
+:: #endif
+:: if "of_action_id_bsn_set_tunnel_dst" in of_g.unified:
         case 2: *id = OF_ACTION_ID_BSN_SET_TUNNEL_DST; break;
+:: #endif
         }
         break;
     }
@@ -275,7 +304,9 @@ extension_action_id_object_id_get(of_object_t *obj, of_object_id_t *id)
         uint16_t subtype;
         buf_u16_get(buf + OF_ACTION_EXPERIMENTER_SUBTYPE_OFFSET, &subtype);
         switch (subtype) {
+:: if "of_action_id_nicira_dec_ttl" in of_g.unified:
         case 18: *id = OF_ACTION_ID_NICIRA_DEC_TTL; break;
+:: #endif
         }
         break;
     }
@@ -684,6 +715,7 @@ of_packet_queue_wire_length_set(of_object_t *obj, int bytes)
                                   bytes);
 }
 
+:: if "of_meter_stats" in of_g.unified:
 /**
  * Get the wire length for a meter band stats list
  * @param obj The object being referenced
@@ -735,6 +767,7 @@ of_meter_stats_wire_length_set(of_object_t *obj, int bytes)
     of_wire_buffer_u16_set(wbuf, 
         OF_OBJECT_ABSOLUTE_OFFSET(obj, OF_METER_STATS_LENGTH_OFFSET), bytes);
 }
+:: #endif
 
 /*
  * Non-message extension push wire values
@@ -743,51 +776,75 @@ of_meter_stats_wire_length_set(of_object_t *obj, int bytes)
 int
 of_extension_object_wire_push(of_object_t *obj)
 {
+:: if "of_action_bsn_mirror" in of_g.unified:
     of_action_bsn_mirror_t *action_mirror;
+:: #endif
+:: if "of_action_id_bsn_mirror" in of_g.unified:
     of_action_id_bsn_mirror_t *action_id_mirror;
+:: #endif
+:: if "of_action_bsn_set_tunnel_dst" in of_g.unified:
     of_action_bsn_set_tunnel_dst_t *action_set_tunnel_dst;
+:: #endif
+:: if "of_action_id_bsn_set_tunnel_dst" in of_g.unified:
     of_action_id_bsn_set_tunnel_dst_t *action_id_set_tunnel_dst;
+:: #endif
+:: if "of_action_nicira_dec_ttl" in of_g.unified:
     of_action_nicira_dec_ttl_t *action_nicira_dec_ttl;
+:: #endif
+:: if "of_action_id_nicira_dec_ttl" in of_g.unified:
     of_action_id_nicira_dec_ttl_t *action_id_nicira_dec_ttl;
+:: #endif
 
     /* Push exp type, subtype */
     switch (obj->object_id) {
+:: if "of_action_bsn_mirror" in of_g.unified:
     case OF_ACTION_BSN_MIRROR:
         action_mirror = (of_action_bsn_mirror_t *)obj;
         of_action_bsn_mirror_experimenter_set(action_mirror,
             OF_EXPERIMENTER_ID_BSN);
         of_action_bsn_mirror_subtype_set(action_mirror, 1);
         break;
+:: #endif
+:: if "of_action_id_bsn_mirror" in of_g.unified:
     case OF_ACTION_ID_BSN_MIRROR:
         action_id_mirror = (of_action_id_bsn_mirror_t *)obj;
         of_action_id_bsn_mirror_experimenter_set(action_id_mirror,
             OF_EXPERIMENTER_ID_BSN);
         of_action_id_bsn_mirror_subtype_set(action_id_mirror, 1);
         break;
+:: #endif
+:: if "of_action_bsn_set_tunnel_dst" in of_g.unified:
     case OF_ACTION_BSN_SET_TUNNEL_DST:
         action_set_tunnel_dst = (of_action_bsn_set_tunnel_dst_t *)obj;
         of_action_bsn_set_tunnel_dst_experimenter_set(action_set_tunnel_dst,
             OF_EXPERIMENTER_ID_BSN);
         of_action_bsn_set_tunnel_dst_subtype_set(action_set_tunnel_dst, 2);
         break;
+:: #endif
+:: if "of_action_id_bsn_set_tunnel_dst" in of_g.unified:
     case OF_ACTION_ID_BSN_SET_TUNNEL_DST:
         action_id_set_tunnel_dst = (of_action_id_bsn_set_tunnel_dst_t *)obj;
         of_action_id_bsn_set_tunnel_dst_experimenter_set(action_id_set_tunnel_dst,
             OF_EXPERIMENTER_ID_BSN);
         of_action_id_bsn_set_tunnel_dst_subtype_set(action_id_set_tunnel_dst, 2);
         break;
+:: #endif
+:: if "of_action_nicira_dec_ttl" in of_g.unified:
     case OF_ACTION_NICIRA_DEC_TTL:
         action_nicira_dec_ttl = (of_action_nicira_dec_ttl_t *)obj;
         of_action_nicira_dec_ttl_experimenter_set(action_nicira_dec_ttl,
             OF_EXPERIMENTER_ID_NICIRA);
         of_action_nicira_dec_ttl_subtype_set(action_nicira_dec_ttl, 18);
         break;
+:: #endif
+:: if "of_action_id_nicira_dec_ttl" in of_g.unified:
     case OF_ACTION_ID_NICIRA_DEC_TTL:
         action_id_nicira_dec_ttl = (of_action_id_nicira_dec_ttl_t *)obj;
         of_action_id_nicira_dec_ttl_experimenter_set(action_id_nicira_dec_ttl,
             OF_EXPERIMENTER_ID_NICIRA);
         of_action_id_nicira_dec_ttl_subtype_set(action_id_nicira_dec_ttl, 18);
         break;
+:: #endif
     default:
         break;
     }
@@ -32,6 +32,7 @@ Intended to be imported into another namespace
 """
 
 import sys
+import json
 import of_g
 
 
@@ -59,17 +60,57 @@ def config_check(str, dictionary = of_g.code_gen_config):
 #
 ################################################################
 
-def debug(obj):
+##
+# Log levels.  Messages are written to the log file if their level is at
+# most of_g.loxigen_log_level.
+LOG_ERROR = 0
+LOG_INFO = 1
+LOG_VERBOSE = 2
+log_level_names = ["error", "info", "verbose"]
+
+def log_enabled(level):
+    """
+    Return True if messages of the given level are written to the log
+    """
+    return level <= of_g.loxigen_log_level
+
+def format_message(obj, args):
     """
-    Debug output to the current both the log file and debug output
-    @param out_str The stringified output to write
+    Return obj % args, or str(obj) if there are no args
     """
-    of_g.loxigen_dbg_file.write(str(obj) + "\n")
-    log(obj)
+    if args:
+        return obj % args
+    return str(obj)
+
+def write_log(level, message):
+    if of_g.loxigen_log_format == "json":
+        message = json.dumps(dict(level=log_level_names[level],
+                                  message=message), sort_keys=True)
+    of_g.loxigen_log_file.write(message + "\n")
 
-def log(obj):
+def debug(obj, *args):
+    """
+    Debug output to both the log file and the debug output
+    @param obj The output to write, or a format string for args
+    """
+    message = format_message(obj, args)
+    of_g.loxigen_dbg_file.write(message + "\n")
+    write_log(LOG_ERROR, message)
+
+def log(obj, *args):
     """
     Log output to the current global log file
-    @param out_str The stringified output to write
+    @param obj The output to write, or a format string for args; it is
+    only formatted if the message is written
+    """
+    if LOG_INFO <= of_g.loxigen_log_level:
+        write_log(LOG_INFO, format_message(obj, args))
+
+def verbose(obj, *args):
+    """
+    Log detailed output, written only with --log-level=verbose
+    @param obj The output to write, or a format string for args; it is
+    only formatted if the message is written
     """
-    of_g.loxigen_log_file.write(str(obj) + "\n")
+    if LOG_VERBOSE <= of_g.loxigen_log_level:
+        write_log(LOG_VERBOSE, format_message(obj, args))
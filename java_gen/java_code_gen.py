@@ -23,7 +23,7 @@ def gen_all_java(out, name):
     stat_types = list()
     queue_prop = list()
     lists = list()
-    for cls in of_g.unified:
+    for cls in sorted(of_g.unified):
         print "! Classifying %s" % cls
         if cls in [ 'of_stats_reply', 'of_flow_mod', 'of_stats_request' ] :
             continue # doesn't work?!
@@ -65,4 +65,3 @@ def gen_all_java(out, name):
     msgs.create_of_type_enum(messages,srcdir)
     with open('README.java-lang') as readme_src:
         out.writelines(readme_src.readlines())
-    out.close()
@@ -81,6 +81,12 @@ modules = {
     4: ["action", "common", "const", "instruction", "message", "meter_band", "oxm", "util"],
 }
 
+def reset():
+    """
+    Forget the class models built from the previous front end results
+    """
+    py_gen.codegen.ofclasses_cache.clear()
+
 def make_gen(name, version):
     fn = getattr(py_gen.codegen, "generate_" + name)
     return lambda out, name: fn(out, name, version)
@@ -0,0 +1,156 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+##
+# @brief Persistent cache of the front end results
+#
+# The front end (parsing, analysis and unification of the input files)
+# is a pure function of the input files, the front end sources and the
+# target version list.  Its results live in of_g; this module saves them
+# to disk keyed by a hash of everything they depend on, and restores them
+# on later runs so that only the backend has to be executed.
+#
+
+import os
+import sys
+import hashlib
+import cPickle as pickle
+import of_g
+from generic_utils import *
+
+##
+# Bump this whenever the set or the layout of the cached variables changes
+CACHE_FORMAT = 5
+
+##
+# The of_g variables computed by the front end
+state_names = [
+    "wire_ver_map",
+    "identifiers",
+    "identifiers_by_group",
+    "identifiers_by_value",
+    "ordered_classes",
+    "ordered_members",
+    "ordered_messages",
+    "ordered_non_messages",
+    "ordered_list_objects",
+    "ordered_pseudo_objects",
+    "standard_class_order",
+    "all_class_order",
+    "base_length",
+    "is_fixed_length",
+    "object_id",
+    "unified",
+    "class_signatures",
+    "special_offsets",
+    "class_info",
+]
+
+def cache_key(input_files, source_files):
+    """
+    Compute the cache key for the given front end inputs
+
+    @param input_files The list of openflow_input files
+    @param source_files The list of source files implementing the front end
+    @returns A hex digest identifying the front end results
+    """
+    h = hashlib.sha1()
+    h.update("format %d\n" % CACHE_FORMAT)
+    h.update("python %s\n" % sys.version)
+    h.update("versions %s\n" % repr(of_g.target_version_list))
+    h.update("classes %s\n" % repr(of_g.options.classes))
+    h.update("exclude classes %s\n" % repr(of_g.options.exclude_classes))
+    for filename in list(input_files) + sorted(source_files):
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        h.update("%s %d\n" % (os.path.basename(filename), len(contents)))
+        h.update(contents)
+    return h.hexdigest()
+
+def capture():
+    """
+    Return the front end results currently in of_g
+
+    @returns A dict from variable name to value
+    """
+    return dict([(name, getattr(of_g, name)) for name in state_names])
+
+def restore(state):
+    """
+    Set the front end results in of_g
+
+    @param state A dict as returned by capture
+    """
+    for name in state_names:
+        setattr(of_g, name, state[name])
+
+def cache_filename(cache_dir, key):
+    return os.path.join(cache_dir, "frontend-%s.pickle" % key)
+
+def load(cache_dir, key):
+    """
+    Restore the front end results from the cache
+
+    @param cache_dir The cache directory
+    @param key The key returned by cache_key
+    @returns True if the results were found and restored into of_g
+    """
+    filename = cache_filename(cache_dir, key)
+    try:
+        with open(filename, 'rb') as f:
+            state = pickle.load(f)
+    except (IOError, EOFError, pickle.UnpicklingError) as e:
+        if os.path.exists(filename):
+            log("Ignoring unreadable front end cache %s: %s", filename, e)
+        return False
+
+    restore(state)
+    log("Loaded front end results from %s", filename)
+    return True
+
+def save(cache_dir, key):
+    """
+    Save the front end results currently in of_g to the cache
+
+    The file is written under a temporary name and renamed into place so
+    that concurrent generator runs never see a partial cache entry.
+
+    @param cache_dir The cache directory
+    @param key The key returned by cache_key
+    """
+    try:
+        os.makedirs(cache_dir)
+    except OSError:
+        if not os.path.isdir(cache_dir):
+            raise
+    state = capture()
+    filename = cache_filename(cache_dir, key)
+    tmp_filename = "%s.%d.tmp" % (filename, os.getpid())
+    with open(tmp_filename, 'wb') as f:
+        pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+    os.rename(tmp_filename, filename)
+    log("Saved front end results to %s", filename)
@@ -0,0 +1,297 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+##
+# @brief Selection of the classes to generate
+#
+# The --classes and --exclude-classes options select a subset of the
+# classes read from the input files.  The unified model is pruned to that
+# subset (plus the classes it depends on) before object IDs are
+# assigned, so every backend sees the same, self-consistent set.
+#
+
+import copy
+import fnmatch
+import of_g
+from generic_utils import *
+import loxi_utils.loxi_utils as loxi_utils
+import loxi_front_end.type_maps as type_maps
+
+##
+# Classes that are always generated: the message header, used to parse
+# any message, and the classes the hand written parts of the C backend
+# refer to (length and offset macros, flow mod and experimenter checks,
+# flow_removed setup, the action list utilities and the match conversion
+# functions, which cover every OXM).  The inheritance parents in type_maps
+# are required as well, since each backend has hand written code for each
+# of them.
+required_classes = [
+    "of_header",
+    "of_flow_add",
+    "of_flow_modify",
+    "of_flow_modify_strict",
+    "of_flow_delete",
+    "of_flow_delete_strict",
+    "of_flow_removed",
+    "of_flow_stats_entry",
+    "of_packet_in",
+    "of_experimenter",
+    "of_experimenter_stats_request",
+    "of_experimenter_stats_reply",
+    "of_match_v1",
+    "of_match_v2",
+    "of_match_v3",
+    "of_action_output",
+    "of_oxm_*",
+]
+
+##
+# The type_maps tables which are restricted to the generated classes, and
+# a copy of their original contents
+pruned_type_maps = ["inheritance_data", "inheritance_map", "message_types",
+                    "stats_request_list", "stats_reply_list",
+                    "extension_objects"]
+original_type_maps = None
+
+def split_patterns(value):
+    """
+    Split a comma separated option value into a list of patterns
+    """
+    if not value:
+        return []
+    return [x.strip() for x in value.split(",") if x.strip()]
+
+def filter_patterns():
+    """
+    Return the (include, exclude) pattern lists given on the command line
+    """
+    return (split_patterns(of_g.options.classes),
+            split_patterns(of_g.options.exclude_classes))
+
+def pattern_to_category(pattern):
+    """
+    Return the class category named by pattern, or None
+
+    Categories may be given in the singular or the plural, e.g. "action"
+    or "actions".
+    """
+    categories = set([info["category"] for info in of_g.class_info.values()])
+    if pattern in categories:
+        return pattern
+    if pattern.endswith("s") and pattern[:-1] in categories:
+        return pattern[:-1]
+    return None
+
+def match_classes(patterns):
+    """
+    Return the set of classes matching any of the patterns
+
+    @param patterns A list of class name globs (e.g. "of_bsn_*") and
+    category names (e.g. "actions")
+    """
+    matched = set()
+    for pattern in patterns:
+        category = pattern_to_category(pattern)
+        if category:
+            found = [cls for cls, info in of_g.class_info.items()
+                     if info["category"] == category]
+        else:
+            found = fnmatch.filter(of_g.class_info.keys(), pattern)
+        if not found:
+            debug("Warning: class pattern %s matches no class", pattern)
+        matched.update(found)
+    return matched
+
+def member_classes(m_type):
+    """
+    Return the classes a member type refers to
+    """
+    types = [m_type]
+    if m_type in of_g.of_mixed_types:
+        types = [t for v, t in of_g.of_mixed_types[m_type].items()
+                 if v != "short_name"]
+    return [t[:-2] for t in types
+            if t.endswith("_t") and t[:-2] in of_g.unified]
+
+def class_dependencies(cls):
+    """
+    Return the classes that must be generated along with cls
+
+    These are the classes of its members, the entry type of a list, the
+    inheritance parent and, for a parent, the header class sharing its
+    layout and the experimenter subclass that unknown extensions decode
+    to.
+    """
+    deps = set()
+    for version, value in of_g.unified[cls].items():
+        if version == "union":
+            continue
+        for member in value.get("members", []):
+            deps.update(member_classes(member["m_type"]))
+    info = of_g.class_info[cls]
+    if info["entry_type"] and info["entry_type"] in of_g.unified:
+        deps.add(info["entry_type"])
+    if info["parent"]:
+        deps.add(info["parent"])
+    if cls in type_maps.inheritance_map:
+        for subcls in [cls + "_header", cls + "_experimenter"]:
+            if subcls in of_g.unified:
+                deps.add(subcls)
+    return deps
+
+def select_classes(include, exclude):
+    """
+    Compute the set of classes to generate
+
+    @param include Patterns of the classes to generate, or [] for all
+    @param exclude Patterns of the classes not to generate
+    @returns The selected classes, closed under class_dependencies.
+    Dependencies are kept even if they match an exclude pattern.
+    """
+    if include:
+        selected = match_classes(include)
+    else:
+        selected = set(of_g.class_info.keys())
+    selected -= match_classes(exclude)
+
+    required = set([cls for cls in type_maps.inheritance_map
+                    if cls in of_g.unified])
+    for pattern in required_classes:
+        required.update(fnmatch.filter(of_g.unified.keys(), pattern))
+    pending = list(selected | required)
+    while pending:
+        cls = pending.pop()
+        selected.add(cls)
+        for dep in class_dependencies(cls):
+            if dep not in selected:
+                verbose("Keeping %s, needed by %s", dep, cls)
+                selected.add(dep)
+                pending.append(dep)
+    return selected
+
+def prune(selected):
+    """
+    Remove the classes not in selected from the front end results in of_g
+    """
+    removed = set(of_g.unified.keys()) - selected
+    for cls in removed:
+        verbose("Excluding class %s", cls)
+        del of_g.unified[cls]
+        del of_g.class_info[cls]
+        for table in [of_g.ordered_members, of_g.class_signatures]:
+            table.pop(cls, None)
+    for wire_version, classes in of_g.ordered_classes.items():
+        of_g.ordered_classes[wire_version] = \
+            [cls for cls in classes if cls not in removed]
+    for key in of_g.base_length.keys():
+        if key[0] in removed:
+            del of_g.base_length[key]
+    of_g.is_fixed_length = set([key for key in of_g.is_fixed_length
+                                if key[0] not in removed])
+    for key in of_g.special_offsets.keys():
+        if key[0] in removed:
+            del of_g.special_offsets[key]
+
+def restore_table(table, original):
+    """
+    Restore a table pruned in place to its original contents
+
+    Pruning only removes entries, so nested tables are restored in place
+    and tables shared by several others stay shared.
+    """
+    if isinstance(table, dict):
+        for key in table.keys():
+            if key not in original:
+                del table[key]
+        for key, value in original.items():
+            if key in table and isinstance(value, (dict, list, set)):
+                restore_table(table[key], value)
+            else:
+                table[key] = copy.deepcopy(value)
+    elif isinstance(table, list):
+        if table and isinstance(table[0], dict):
+            for entry, value in zip(table, original):
+                restore_table(entry, value)
+        else:
+            table[:] = original
+    else:
+        table.clear()
+        table.update(original)
+
+def restore_type_maps():
+    """
+    Undo prune_type_maps
+    """
+    if original_type_maps is None:
+        return
+    for name, original in zip(pruned_type_maps, original_type_maps):
+        restore_table(getattr(type_maps, name), original)
+
+def prune_type_maps():
+    """
+    Restrict the static class tables in type_maps to the classes in
+    of_g.unified
+
+    The backends take the subclasses of each inheritance parent, the
+    message and stats types and the extensions from these tables, so
+    they have to agree with the pruned unified model.  This is run after
+    the front end (whether or not its results came from the cache); the
+    original tables are restored first, so it may be run repeatedly.
+    """
+    global original_type_maps
+    if original_type_maps is None:
+        original_type_maps = copy.deepcopy(
+            [getattr(type_maps, name) for name in pruned_type_maps])
+    restore_type_maps()
+
+    # Some of these tables are shared between parents (the OF 1.3 action
+    # and action_id types), so build new ones rather than delete in place
+    for parent, versioned in type_maps.inheritance_data.items():
+        for version, subclasses in versioned.items():
+            versioned[version] = dict(
+                [(subcls, value) for (subcls, value) in subclasses.items()
+                 if parent + "_" + subcls in of_g.unified])
+    for parent, subclasses in type_maps.inheritance_map.items():
+        if parent not in of_g.unified:
+            del type_maps.inheritance_map[parent]
+            continue
+        for subcls in list(subclasses):
+            if parent + "_" + subcls not in of_g.unified:
+                subclasses.remove(subcls)
+    for version, classes in type_maps.message_types.items():
+        for name in classes.keys():
+            if "of_" + name not in of_g.unified:
+                del classes[name]
+    for name in ["stats_request_list", "stats_reply_list"]:
+        table = getattr(type_maps, name)
+        table[:] = [cls for cls in table if cls in of_g.unified]
+    for ext_obj in type_maps.extension_objects:
+        for version, exp_list in ext_obj.items():
+            for exp_name, classes in exp_list.items():
+                for cls in classes.keys():
+                    if cls not in of_g.unified:
+                        del classes[cls]
@@ -0,0 +1,214 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+##
+# @brief Hand-written parser for the LOXI input language
+#
+# This accepts the same language as the pyparsing grammar in parser.py and
+# produces the same AST, as plain nested lists:
+#
+#   ['struct', name, [[type, member_name], ...]]
+#   ['enum', name, [[member_name, value], ...]]
+#   ['metadata', key, value]
+#
+# It scans the source with a handful of regular expressions instead of
+# going through pyparsing's generic machinery, which makes it much faster
+# on the full set of input files.
+#
+
+import re
+
+class ParseError(Exception):
+    """
+    Raised when the input is not valid.
+
+    loc is the offset of the error in the source, lineno and col are the
+    (1-based) line and column.
+    """
+    def __init__(self, msg, src, loc):
+        self.msg = msg
+        self.loc = loc
+        self.lineno = src.count("\n", 0, loc) + 1
+        if loc < len(src) and src[loc] == "\n":
+            self.col = 1
+        else:
+            self.col = loc - src.rfind("\n", 0, loc)
+        Exception.__init__(self, "%s (at char %d), (line:%d, col:%d)" %
+                           (msg, loc, self.lineno, self.col))
+
+# Whitespace and C/C++ style comments
+skip_re = re.compile(r'(?:\s+|/\*(?:[^*]*\*+)+?/|//(?:\\\n|[^\n])*)*')
+word_re = re.compile(r'[A-Za-z0-9_]+')
+integer_re = re.compile(r'0x|[0-9]+')
+hex_re = re.compile(r'[0-9a-fA-F]+')
+
+# Characters that may not follow a keyword
+ident_chars = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_$')
+
+class Parser(object):
+    """
+    Recursive descent parser over a source string
+
+    pos is always the offset of the next unconsumed character.
+    """
+
+    def __init__(self, src):
+        self.src = src
+        self.pos = 0
+
+    def error(self, expected):
+        raise ParseError("Expected %s" % expected, self.src, self.pos)
+
+    def skip(self):
+        self.pos = skip_re.match(self.src, self.pos).end()
+
+    def peek_char(self):
+        self.skip()
+        return self.src[self.pos:self.pos+1]
+
+    def at_keyword(self, kw):
+        self.skip()
+        end = self.pos + len(kw)
+        return self.src.startswith(kw, self.pos) and \
+            (end >= len(self.src) or self.src[end] not in ident_chars)
+
+    def at_word(self):
+        self.skip()
+        return word_re.match(self.src, self.pos) is not None
+
+    def expect_char(self, c):
+        if self.peek_char() != c:
+            self.error('"%s"' % c)
+        self.pos += 1
+
+    def expect_word(self, name="identifier"):
+        self.skip()
+        m = word_re.match(self.src, self.pos)
+        if not m:
+            self.error(name)
+        self.pos = m.end()
+        return m.group()
+
+    def parse_type(self):
+        """
+        Parse a type name: a scalar, array (foo[4]) or list (list(foo)).
+        No whitespace is allowed inside array and list types.
+        """
+        start = self.pos
+        base = self.expect_word("type name")
+        src = self.src
+        if base == "list" and src[self.pos:self.pos+1] not in ident_chars:
+            if src[self.pos:self.pos+1] != '(':
+                self.error('"("')
+            self.pos += 1
+            m = word_re.match(src, self.pos)
+            if not m:
+                self.error("identifier")
+            self.pos = m.end()
+            if src[self.pos:self.pos+1] != ')':
+                self.error('")"')
+            self.pos += 1
+        elif src[self.pos:self.pos+1] == '[':
+            self.pos += 1
+            m = word_re.match(src, self.pos)
+            if not m:
+                self.error("array length")
+            self.pos = m.end()
+            if src[self.pos:self.pos+1] != ']':
+                self.error('"]"')
+            self.pos += 1
+        return src[start:self.pos]
+
+    def parse_struct(self):
+        self.pos += len("struct")
+        name = self.expect_word()
+        self.expect_char('{')
+        members = []
+        while self.at_word():
+            m_type = self.parse_type()
+            m_name = self.expect_word()
+            self.expect_char(';')
+            members.append([m_type, m_name])
+        self.expect_char('}')
+        self.expect_char(';')
+        return ['struct', name, members]
+
+    def parse_integer(self):
+        self.skip()
+        m = integer_re.match(self.src, self.pos)
+        if not m:
+            self.error("integer")
+        self.pos = m.end()
+        if m.group() == '0x':
+            m = hex_re.match(self.src, self.pos)
+            if not m:
+                self.error("hex digits")
+            self.pos = m.end()
+            return int(m.group(), 16)
+        return int(m.group(), 0)
+
+    def parse_enum(self):
+        self.pos += len("enum")
+        name = self.expect_word()
+        self.expect_char('{')
+        members = []
+        while self.at_word():
+            m_name = self.expect_word()
+            self.expect_char('=')
+            value = self.parse_integer()
+            members.append([m_name, value])
+            if self.peek_char() != ',':
+                break
+            self.pos += 1
+        self.expect_char('}')
+        self.expect_char(';')
+        return ['enum', name, members]
+
+    def parse_metadata(self):
+        self.pos += 1
+        if not self.at_keyword("version"):
+            self.error('"version"')
+        self.pos += len("version")
+        value = self.expect_word("value")
+        return ['metadata', 'version', value]
+
+    def parse(self):
+        ast = []
+        while True:
+            if self.at_keyword("struct"):
+                ast.append(self.parse_struct())
+            elif self.at_keyword("enum"):
+                ast.append(self.parse_enum())
+            elif self.peek_char() == '#':
+                ast.append(self.parse_metadata())
+            elif self.pos == len(self.src):
+                return ast
+            else:
+                self.error("end of text")
+
+def parse(src):
+    return Parser(src).parse()
@@ -48,8 +48,8 @@ def add_identifier(name, ofp_name, ofp_group, value, version, all_idents, idents
 NOTE: Identifier %s has different ofp name or group in version %s
 From ofp name %s, group %s to name %s, group %s.
 This could indicate a name collision in LOXI identifier translation.
-""" % (name, str(version), all_idents[name]["ofp_name"],
-    all_idents[name]["ofp_group"], ofp_name, ofp_group))
+""", name, version, all_idents[name]["ofp_name"],
+    all_idents[name]["ofp_group"], ofp_name, ofp_group)
             # Update stuff assuming newer versions processed later
             all_idents[name]["ofp_name"] = ofp_name
             all_idents[name]["ofp_group"] = ofp_group
@@ -66,6 +66,24 @@ This could indicate a name collision in LOXI identifier translation.
         if name not in idents_by_group[ofp_group]:
             idents_by_group[ofp_group].append(name)
 
+def build_value_index(all_idents, idents_by_group):
+    """
+    Build the reverse index from values to identifiers
+
+    @param all_idents The identifiers dict (see of_g.identifiers)
+    @param idents_by_group The identifiers_by_group dict
+    @returns A dict indexed by (ofp_group, version, value) giving the
+    ofp_name of the identifier.  If several identifiers in a group share
+    a value, the one defined first wins.
+    """
+    index = {}
+    for group, idents in idents_by_group.items():
+        for name in idents:
+            info = all_idents[name]
+            for version, value in info["values_by_version"].items():
+                index.setdefault((group, version, value), info["ofp_name"])
+    return index
+
 def all_versions_agree(all_idents, version_list, name):
     val_list = all_idents[name]["values_by_version"]
     for version in version_list:
@@ -0,0 +1,153 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+##
+# @brief Export and import of the front end results
+#
+# The front end results (the of_g variables listed in cache.state_names)
+# can be written to an IR file with --export-ir and read back with
+# --from-ir, so that several backend runs can share one front end run
+# and other tools can use the model without importing loxigen.
+#
+# Two encodings are supported:
+#
+# - JSON (files named *.json).  Dicts whose keys are not all strings, tuples
+#   and sets, which JSON lacks, are written as objects with a single key
+#   "__items__" (a list of [key, value] pairs), "__tuple__" or "__set__".
+# - A binary encoding using the marshal module, which is much faster to
+#   load but specific to the Python version.
+#
+# Both hold the same top level object:
+#
+# {
+#     "format": <the front end cache format number>,
+#     "target_versions": <the wire versions generated>,
+#     "classes": <--classes>, "exclude_classes": <--exclude-classes>,
+#     "state": <dict from of_g variable name to value>
+# }
+#
+
+import json
+import marshal
+import of_g
+from generic_utils import *
+import loxi_front_end.cache as cache
+
+##
+# The start of a binary IR file
+BINARY_MAGIC = "LOXIIR\n"
+
+class IRError(Exception):
+    pass
+
+def encode_json(value):
+    """
+    Convert value to an equivalent structure the json module can write
+    """
+    if isinstance(value, dict):
+        if [key for key in value if not isinstance(key, str)]:
+            return {"__items__": [[encode_json(key), encode_json(value[key])]
+                                  for key in sorted(value)]}
+        return dict([(key, encode_json(item)) for key, item in value.items()])
+    elif isinstance(value, tuple):
+        return {"__tuple__": [encode_json(item) for item in value]}
+    elif isinstance(value, (set, frozenset)):
+        return {"__set__": [encode_json(item) for item in sorted(value)]}
+    elif isinstance(value, list):
+        return [encode_json(item) for item in value]
+    return value
+
+def decode_json(value):
+    """
+    Undo encode_json on a structure read by the json module
+    """
+    if isinstance(value, dict):
+        if "__items__" in value:
+            return dict([(decode_json(key), decode_json(item))
+                         for key, item in value["__items__"]])
+        elif "__tuple__" in value:
+            return tuple([decode_json(item) for item in value["__tuple__"]])
+        elif "__set__" in value:
+            return set([decode_json(item) for item in value["__set__"]])
+        return dict([(str(key), decode_json(item))
+                     for key, item in value.items()])
+    elif isinstance(value, list):
+        return [decode_json(item) for item in value]
+    elif isinstance(value, unicode):
+        return str(value)
+    return value
+
+def export(filename):
+    """
+    Write the front end results currently in of_g to an IR file
+
+    @param filename The IR file; JSON is used if it ends in .json, the
+    binary encoding otherwise
+    """
+    ir = {
+        "format": cache.CACHE_FORMAT,
+        "target_versions": of_g.target_version_list,
+        "classes": of_g.options.classes,
+        "exclude_classes": of_g.options.exclude_classes,
+        "state": cache.capture(),
+    }
+    if filename.endswith(".json"):
+        with open(filename, "w") as f:
+            json.dump(encode_json(ir), f, sort_keys=True, separators=(",", ":"))
+    else:
+        with open(filename, "wb") as f:
+            f.write(BINARY_MAGIC)
+            marshal.dump(ir, f)
+    log("Exported front end results to %s", filename)
+
+def load(filename):
+    """
+    Restore the front end results from an IR file into of_g
+
+    The target versions and class selection the IR was generated with
+    replace those given on the command line.
+
+    @param filename An IR file written by export, in either encoding
+    @raises IRError if the file can't be read or has another format
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+        if data.startswith(BINARY_MAGIC):
+            ir = marshal.loads(data[len(BINARY_MAGIC):])
+        else:
+            ir = decode_json(json.loads(data))
+    except (IOError, EOFError, ValueError, TypeError) as e:
+        raise IRError("cannot read %s: %s" % (filename, e))
+    if not isinstance(ir, dict) or ir.get("format") != cache.CACHE_FORMAT:
+        raise IRError("%s has an unsupported format" % filename)
+
+    cache.restore(ir["state"])
+    of_g.target_version_list = ir["target_versions"]
+    of_g.options.classes = ir["classes"]
+    of_g.options.exclude_classes = ir["exclude_classes"]
+    log("Loaded front end results from %s", filename)
@@ -352,6 +352,9 @@ def class_is_virtual(cls):
     """
     Returns True if cls is a virtual class
     """
+    info = of_g.class_info.get(cls)
+    if info is not None:
+        return info["virtual"]
     if cls in inheritance_map:
         return True
     if cls.find("header") > 0:
@@ -969,6 +972,10 @@ def class_is_extension(cls, version):
     Accepts of_g.OF_VERSION_ANY
     """
 
+    info = of_g.class_info.get(cls)
+    if info is not None and version in info["extension"]:
+        return info["extension"][version]
+
     for ext_obj in extension_objects:
         if cls_is_ext_obj(cls, version, ext_obj):
             return True
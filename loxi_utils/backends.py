@@ -0,0 +1,67 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+"""
+@brief Registry of the language backends
+
+A backend is a module, or any other object, with a "targets" dict. The
+dict maps each generated file name, relative to the install directory,
+to a function fn(out, name) that writes the file's contents to the
+file-like object out. A backend may also have a "reset" function, which
+is called when the front end results change in watch mode.
+
+Backends read the front end results from of_g and render templates
+through loxi_utils. Several backends can therefore be run on the
+results of a single front end pass, and they share its cache and the
+compiled templates.
+
+The backend for language X is the module lang_X, unless another
+backend was registered under that name. An out of tree backend can put
+a lang_X module on the Python path. It can also call register() from a
+module that is loaded with --backend-module.
+"""
+
+##
+# The backends, indexed by language name
+backends = {}
+
+def register(name, backend):
+    """
+    Register the backend for the language name
+    """
+    backends[name] = backend
+
+def get_backend(name):
+    """
+    Return the backend for the language name
+
+    If no backend was registered for it, the module lang_<name> is imported
+    and registered.
+    """
+    if name not in backends:
+        register(name, __import__("lang_" + name))
+    return backends[name]
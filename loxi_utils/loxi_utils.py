@@ -33,7 +33,9 @@ Utility functions for OpenFlow class generation
 These may need to be sorted out into language specific functions
 """
 
+import os
 import sys
+import hashlib
 import of_g
 import tenjin
 
@@ -66,6 +68,36 @@ def type_dec_to_count_base(m_type):
         base_type = m_type
     return count, base_type
 
+##
+# The class kind predicates below, as (kind, compute function) pairs in
+# definition order.  The front end evaluates them once per class and
+# stores the result in of_g.class_info; see build_class_info.
+class_kinds = []
+
+def class_kind(kind):
+    """
+    Decorator registering a class kind predicate
+
+    The decorated predicate answers from of_g.class_info for the classes
+    recorded there and only falls back to computing the answer (from the
+    class name or the unified view) for other names.  The original
+    function remains available as the compute attribute.
+
+    @param kind The name of the kind in the class info "kinds" set
+    """
+    def decorator(compute):
+        def lookup(cls):
+            info = of_g.class_info.get(cls)
+            if info is None:
+                return compute(cls)
+            return kind in info["kinds"]
+        lookup.__name__ = compute.__name__
+        lookup.__doc__ = compute.__doc__
+        lookup.compute = compute
+        class_kinds.append((kind, compute))
+        return lookup
+    return decorator
+
 ##
 # Class types:
 #
@@ -88,12 +120,14 @@ def type_dec_to_count_base(m_type):
 #
 #
 
+@class_kind("message")
 def class_is_message(cls):
     """
     Return True if cls is a message object based on info in unified
     """
     return "xid" in of_g.unified[cls]["union"] and cls != "of_header"
 
+@class_kind("tlv16")
 def class_is_tlv16(cls):
     """
     Return True if cls_name is an object which uses uint16 for type and length
@@ -119,6 +153,7 @@ def class_is_tlv16(cls):
         return True
     return False
 
+@class_kind("u16_len")
 def class_is_u16_len(cls):
     """
     Return True if cls_name is an object which uses initial uint16 length
@@ -126,6 +161,7 @@ def class_is_u16_len(cls):
     return cls in ["of_group_desc_stats_entry", "of_group_stats_entry",
                    "of_flow_stats_entry", "of_bucket", "of_table_features"]
 
+@class_kind("oxm")
 def class_is_oxm(cls):
     """
     Return True if cls_name is an OXM object
@@ -134,6 +170,7 @@ def class_is_oxm(cls):
         return True
     return False
 
+@class_kind("action")
 def class_is_action(cls):
     """
     Return True if cls_name is an action object
@@ -155,6 +192,7 @@ def class_is_action(cls):
 
     return False
 
+@class_kind("action_id")
 def class_is_action_id(cls):
     """
     Return True if cls_name is an action object
@@ -174,6 +212,7 @@ def class_is_action_id(cls):
 
     return False
 
+@class_kind("instruction")
 def class_is_instruction(cls):
     """
     Return True if cls_name is an instruction object
@@ -188,6 +227,7 @@ def class_is_instruction(cls):
 
     return False
 
+@class_kind("meter_band")
 def class_is_meter_band(cls):
     """
     Return True if cls_name is an instruction object
@@ -199,6 +239,7 @@ def class_is_meter_band(cls):
         return True
     return False
 
+@class_kind("hello_elem")
 def class_is_hello_elem(cls):
     """
     Return True if cls_name is an instruction object
@@ -207,6 +248,7 @@ def class_is_hello_elem(cls):
         return True
     return False
 
+@class_kind("queue_prop")
 def class_is_queue_prop(cls):
     """
     Return True if cls_name is a queue_prop object
@@ -221,6 +263,7 @@ def class_is_queue_prop(cls):
 
     return False
 
+@class_kind("table_feature_prop")
 def class_is_table_feature_prop(cls):
     """
     Return True if cls_name is a queue_prop object
@@ -229,6 +272,7 @@ def class_is_table_feature_prop(cls):
         return True
     return False
 
+@class_kind("stats_message")
 def class_is_stats_message(cls):
     """
     Return True if cls_name is a message object based on info in unified
@@ -236,6 +280,7 @@ def class_is_stats_message(cls):
 
     return "stats_type" in of_g.unified[cls]["union"]
 
+@class_kind("list")
 def class_is_list(cls):
     """
     Return True if cls_name is a list object
@@ -255,6 +300,9 @@ def list_to_entry_type(cls):
     """
     Return the entry type for a list
     """
+    info = of_g.class_info.get(cls)
+    if info is not None and info["entry_type"]:
+        return info["entry_type"]
     slen = len("of_list_")
     return "of_" + cls[slen:]
 
@@ -395,6 +443,10 @@ def sub_class_to_var_name(cls):
     pass
 
 def class_is_var_len(cls, version):
+    info = of_g.class_info.get(cls)
+    if info is not None and version in info["var_len"]:
+        return info["var_len"][version]
+
     # Match is special case.  Only version 1.2 (wire version 3) is var
     if cls == "of_match":
         return version == 3
@@ -493,6 +545,49 @@ def accessor_returns_error(a_type, m_type):
     else:
         return False
 
+##
+# Directory in which compiled templates are cached between runs.  If None,
+# compiled templates are only kept in memory.
+template_cache_dir = None
+
+##
+# The process-wide template engines, indexed by (path, prefix)
+template_engines = {}
+
+##
+# The number of templates (including included ones) rendered so far
+templates_rendered = 0
+
+##
+# The full paths of the template files used since this set was last
+# cleared (by the generator, before each target)
+template_files = set()
+
+def template_engine(path, prefix = None):
+    """
+    Return the shared template engine for a template path.
+    path: array of directories to search for templates
+    prefix: optional prefix to use for embedding (for other languages than python)
+
+    The engine keeps every template it compiles, so each template is read
+    and compiled at most once per process (or not at all if it is found in
+    the on-disk cache).
+    """
+    key = (tuple(path), prefix)
+    engine = template_engines.get(key)
+    if engine is None:
+        pp = [ tenjin.PrefixedLinePreprocessor(prefix=prefix) if prefix else tenjin.PrefixedLinePreprocessor() ] # support "::" syntax
+        engine = TemplateEngine(path=path, pp=pp,
+                                cache=TemplateCacheStorage(template_cache_dir))
+        # The compiled code depends on the engine's settings as well as
+        # on the template file
+        engine.cache.settings = repr((
+            [(type(x).__name__, getattr(x, "prefix", None)) for x in engine.pp],
+            engine.templateclass.__name__, engine.lang,
+            sorted(engine.kwargs.items())))
+        template_engines[key] = engine
+    return engine
+
 def render_template(out, name, path, context, prefix = None):
     """
     Render a template using tenjin.
@@ -502,9 +597,10 @@ def render_template(out, name, path, context, prefix = None):
     context: dictionary of variables to pass to the template
     prefix: optional prefix to use for embedding (for other languages than python)
     """
-    pp = [ tenjin.PrefixedLinePreprocessor(prefix=prefix) if prefix else tenjin.PrefixedLinePreprocessor() ] # support "::" syntax
+    global templates_rendered
+    templates_rendered += 1
     template_globals = { "to_str": str, "escape": str } # disable HTML escaping
-    engine = TemplateEngine(path=path, pp=pp)
+    engine = template_engine(path, prefix)
     out.write(engine.render(name, context, template_globals))
 
 def render_static(out, name, path):
@@ -518,16 +614,32 @@ def render_static(out, name, path):
     template_filename = tenjin.FileSystemLoader().find(name, path)
     if not template_filename:
         raise ValueError("template %s not found" % name)
+    template_files.add(os.path.abspath(template_filename))
     with open(template_filename) as infile:
         out.write(infile.read())
 
 class TemplateEngine(tenjin.Engine):
+    def get_template(self, template_name, _context=None, _globals=None):
+        """
+        Record the file of each template used in template_files
+        """
+        if _globals is None:
+            _globals = sys._getframe(1).f_globals
+        template = tenjin.Engine.get_template(self, template_name,
+                                              _context, _globals)
+        pair = self._filepaths.get(self.to_filename(template_name))
+        if pair:
+            template_files.add(pair[1])
+        return template
+
     def include(self, template_name, **kwargs):
         """
         Tenjin has an issue with nested includes that use the same local variable
         names, because it uses the same context dict for each level of nesting.
         The fix is to copy the context.
         """
+        global templates_rendered
+        templates_rendered += 1
         frame = sys._getframe(1)
         locals  = frame.f_locals
         globals = frame.f_globals
@@ -535,3 +647,49 @@ class TemplateEngine(tenjin.Engine):
         context.update(kwargs)
         template = self.get_template(template_name, context, globals)
         return template.render(context, globals, _buf=locals["_buf"])
+
+class TemplateCacheStorage(tenjin.MarshalCacheStorage):
+    """
+    Cache of compiled templates
+
+    Compiled templates are always kept in memory.  If a cache directory is
+    given, their code is also marshalled to a file in that directory named
+    after the template's full path and the settings of the engine that
+    compiled it, rather than next to the template itself.  Tenjin discards
+    an entry when the template's mtime changes.
+    """
+    def __init__(self, cache_dir=None):
+        tenjin.MarshalCacheStorage.__init__(self)
+        self.cache_dir = cache_dir
+        # Set by template_engine to describe the engine's settings
+        self.settings = ""
+
+    def _cache_filename(self, cachepath):
+        # marshal data is specific to the Python and Tenjin versions
+        digest = hashlib.sha1("\n".join([sys.version, tenjin.__version__,
+                                          self.settings, cachepath])).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".cache")
+
+    def _load(self, cachepath):
+        if not self.cache_dir:
+            return None
+        return tenjin.MarshalCacheStorage._load(self, self._cache_filename(cachepath))
+
+    def _store(self, cachepath, dct):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir)
+        except OSError:
+            if not os.path.isdir(self.cache_dir):
+                raise
+        filename = self._cache_filename(cachepath)
+        tmp_filename = "%s.%d.tmp" % (filename, os.getpid())
+        with open(tmp_filename, "wb") as f:
+            f.write(self._dump(dct))
+        os.rename(tmp_filename, filename)
+
+    def _delete(self, cachepath):
+        if not self.cache_dir:
+            return
+        tenjin.MarshalCacheStorage._delete(self, self._cache_filename(cachepath))
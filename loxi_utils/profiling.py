@@ -0,0 +1,123 @@
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+"""
+@brief Timing of generator runs
+
+The generator records how long each front end phase and each target
+takes.  With --profile the timings are printed as a table at the end of
+the run and saved as JSON so they can be tracked across commits.
+"""
+
+import os
+import sys
+import time
+import json
+import resource
+import cProfile
+
+##
+# Recorded timings: a list of (kind, name, seconds) where kind is "phase"
+# or "target"
+timings = []
+
+def record(kind, name, seconds):
+    timings.append((kind, name, seconds))
+
+def timed(kind, name, fn, *args):
+    """
+    Call fn(*args), record how long it took and return its result
+    """
+    start = time.time()
+    try:
+        return fn(*args)
+    finally:
+        record(kind, name, time.time() - start)
+
+def profile_call(filename, fn, *args):
+    """
+    Call fn(*args) under cProfile, dump the statistics to filename and
+    return the result of the call
+    """
+    dirname = os.path.dirname(filename)
+    if dirname and not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            if not os.path.isdir(dirname):
+                raise
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        profiler.dump_stats(filename)
+
+def peak_rss_kb():
+    """
+    Return the peak resident set sizes in KB as a tuple (own, children),
+    where own is that of this process and children that of its largest
+    finished child (e.g. a --jobs worker)
+    """
+    scale = 1
+    if sys.platform == "darwin": # ru_maxrss is in bytes there
+        scale = 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+def report(out, total_seconds, templates_rendered, extra=None):
+    """
+    Write a table of the recorded timings, slowest first, to out and
+    return the same information as a JSON-serializable dict, updated
+    with the extra dict if given
+    """
+    own_rss, children_rss = peak_rss_kb()
+    out.write("\n%-8s %-60s %10s %6s\n" % ("kind", "name", "seconds", "%"))
+    for kind, name, seconds in sorted(timings, key=lambda x: -x[2]):
+        out.write("%-8s %-60s %10.3f %6.1f\n" %
+                  (kind, name, seconds,
+                   total_seconds and 100.0 * seconds / total_seconds or 0))
+    out.write("%-8s %-60s %10.3f\n" % ("total", "", total_seconds))
+    out.write("Peak RSS: %d KB (largest worker %d KB)\n" % (own_rss, children_rss))
+    out.write("Templates rendered: %d\n" % templates_rendered)
+
+    result = dict(total_seconds=total_seconds,
+                  peak_rss_kb=own_rss,
+                  peak_worker_rss_kb=children_rss,
+                  templates_rendered=templates_rendered,
+                  phases=[dict(name=name, seconds=seconds)
+                          for kind, name, seconds in timings if kind == "phase"],
+                  targets=[dict(name=name, seconds=seconds)
+                           for kind, name, seconds in timings if kind == "target"])
+    if extra:
+        result.update(extra)
+    return result
+
+def save(filename, result):
+    with open(filename, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -76,15 +76,25 @@ import string
 import os
 import glob
 import copy
+import itertools
+import multiprocessing
+import StringIO
+import time
 import of_g
 import loxi_front_end.oxm as oxm
 import loxi_front_end.type_maps as type_maps
 import loxi_utils.loxi_utils as loxi_utils
+import loxi_utils.backends as backends
+import loxi_utils.profiling as profiling
 import loxi_front_end.c_parse_utils as c_parse_utils
 import loxi_front_end.identifiers as identifiers
 import pyparsing
 import loxi_front_end.parser as parser
+import loxi_front_end.fast_parser as fast_parser
 import loxi_front_end.translation as translation
+import loxi_front_end.cache as frontend_cache
+import loxi_front_end.class_filter as class_filter
+import loxi_front_end.ir as ir
 
 from generic_utils import *
 
@@ -98,6 +108,24 @@ root_dir = os.path.dirname(os.path.realpath(__file__))
 # of_g variables.
 versions = {}
 
+## Parsed input files, indexed by filename
+#
+# The value is a pair (mtime, ofinput).  In watch mode only the input
+# files whose mtime changed are parsed again.
+parsed_inputs = {}
+
+## The initial values of the front end results in of_g, for watch mode
+initial_frontend_state = None
+
+## The backends of the languages being generated
+lang_backends = []
+
+## The generator function of each target of those languages, indexed by name
+targets = {}
+
+## The template files used by each target, indexed by target name
+target_templates = {}
+
 def config_sanity_check():
     """
     Check the configuration for basic consistency
@@ -125,6 +153,10 @@ config_sanity_check if it is)")
         debug("Conflict: Cannot generate unified functions and lower case \
 unified macros")
         rv = False
+    if of_g.options.from_ir and \
+            (of_g.options.classes or of_g.options.exclude_classes):
+        debug("Classes are selected when the IR is exported, not with --from-ir")
+        rv = False
 
     return rv
 
@@ -146,26 +178,22 @@ def add_class(wire_version, cls, members):
             debug("Error adding %s to unified. Wire ver %d exists" %
                   (cls, wire_version))
             sys.exit(1)
-        uc[wire_version] = {}
         # Check for a matching signature
-        for wver in uc:
-            if type(wver) != type(0): continue
-            if wver == wire_version: continue
-            if not "use_version" in uc[wver]:
-                if sig == loxi_utils.class_signature(uc[wver]["members"]):
-                    log("Matched %s, ver %d to ver %d" %
-                          (cls, wire_version, wver))
-                    # have a match with existing version
-                    uc[wire_version]["use_version"] = wver
-                    # What else to do?
-                    return
+        wver = of_g.class_signatures[cls].get(sig)
+        if wver is not None:
+            verbose("Matched %s, ver %d to ver %d", cls, wire_version, wver)
+            # have a match with existing version
+            uc[wire_version] = dict(use_version=wver)
+            return
     else:  # Haven't seen this entry before
-        log("Adding %s to unified list, ver %d" % (cls, wire_version))
+        verbose("Adding %s to unified list, ver %d", cls, wire_version)
         of_g.unified[cls] = dict(union={})
+        of_g.class_signatures[cls] = {}
         uc = of_g.unified[cls]
 
     # At this point, need to add members for this version
     uc[wire_version] = dict(members = members)
+    of_g.class_signatures[cls][sig] = wire_version
 
     # Per member processing:
     #  Add to union list (I'm sure there's a better way)
@@ -230,7 +258,7 @@ def update_offset(cls, wire_version, name, offset, m_type):
             bytes = of_g.of_base_types[base_type]["bytes"]
         else:
             print "UNKNOWN TYPE for %s %s: %s" % (cls, name, base_type)
-            log("UNKNOWN TYPE for %s %s: %s" % (cls, name, base_type))
+            log("UNKNOWN TYPE for %s %s: %s", cls, name, base_type)
             bytes = -1
 
     # If bytes
@@ -242,13 +270,22 @@ def update_offset(cls, wire_version, name, offset, m_type):
 
     return offset + (count * bytes), len_update
 
-def calculate_offsets_and_lengths(ordered_classes, classes, wire_version):
+def calculate_offsets_and_lengths(ordered_classes, classes, wire_version,
+                                  layouts):
     """
     Generate the offsets for fixed offset class members
     Also calculate the class_sizes when possible.
 
+    The member declarations in classes are shared between versions (and
+    with header classes) and are not modified.  Each class is given a new
+    list of laid out members instead; identical laid out members are
+    shared through layouts, so a declaration used by several versions
+    costs one record per distinct offset.
+
     @param classes The classes to process
     @param wire_version The wire version for this set of classes
+    @param layouts Dict from (name, m_type, offset) to laid out member,
+    shared by all versions
 
     Updates global variables
     """
@@ -261,35 +298,36 @@ def calculate_offsets_and_lengths(ordered_classes, classes, wire_version):
         offset = 0
         last_offset = 0
         last_name = "-"
+        laid_out = []
         for member in classes[cls]:
             m_type = member["m_type"]
             name = member["name"]
             if last_offset == -1:
                 if name == "pad":
-                    log("Skipping pad for special offset for %s" % cls)
+                    verbose("Skipping pad for special offset for %s", cls)
                 else:
-                    log("SPECIAL OFS: Member %s (prev %s), class %s ver %d" %
-                          (name, last_name, cls, wire_version))
+                    verbose("SPECIAL OFS: Member %s (prev %s), class %s ver %d",
+                            name, last_name, cls, wire_version)
                     if (((cls, name) in of_g.special_offsets) and
                         (of_g.special_offsets[(cls, name)] != last_name)):
                         debug("ERROR: special offset prev name changed")
-                        debug("  cls %s. name %s. version %d. was %s. now %s" %
+                        debug("  cls %s. name %s. version %d. was %s. now %s",
                               cls, name, wire_version,
                               of_g.special_offsets[(cls, name)], last_name)
                         sys.exit(1)
                     of_g.special_offsets[(cls, name)] = last_name
 
-            member["offset"] = offset
+            member_offset = offset
             if m_type.find("list(") == 0:
                 (list_name, base_type) = loxi_utils.list_name_extract(m_type)
                 lists.add(list_name)
-                member["m_type"] = list_name + "_t"
+                m_type = list_name + "_t"
                 offset = -1
             elif m_type.find("struct") == 0:
                 debug("ERROR found struct: %s.%s " % (cls, name))
                 sys.exit(1)
             elif m_type == "octets":
-                log("offset gen skipping octets: %s.%s " % (cls, name))
+                verbose("offset gen skipping octets: %s.%s ", cls, name)
                 offset = -1
             else:
                 offset, len_update = update_offset(cls, wire_version, name,
@@ -298,10 +336,16 @@ def calculate_offsets_and_lengths(ordered_classes, classes, wire_version):
                     fixed_offset = offset
                 else:
                     fixed_offset += len_update
-                    log("offset is -1 for %s.%s version %d " %
-                        (cls, name, wire_version))
+                    verbose("offset is -1 for %s.%s version %d ",
+                            cls, name, wire_version)
+            key = (name, m_type, member_offset)
+            if key not in layouts:
+                layouts[key] = dict(m_type=m_type, name=name,
+                                    offset=member_offset)
+            laid_out.append(layouts[key])
             last_offset = offset
             last_name = name
+        classes[cls] = laid_out
         of_g.base_length[(cls, wire_version)] = fixed_offset
         if (offset != -1):
             of_g.is_fixed_length.add((cls, wire_version))
@@ -321,10 +365,16 @@ def process_input_file(filename):
     file.
     """
 
+    log("Processing struct file: %s", filename)
+
     # Parse the input file
+    if of_g.options.parser == "pyparsing":
+        parse = parser.parse
+    else:
+        parse = fast_parser.parse
     try:
-        ast = parser.parse(open(filename, 'r').read())
-    except pyparsing.ParseBaseException as e:
+        ast = parse(open(filename, 'r').read())
+    except (pyparsing.ParseBaseException, fast_parser.ParseError) as e:
         print "Parse error in %s: %s" % (os.path.basename(filename), str(e))
         sys.exit(1)
 
@@ -347,7 +397,7 @@ def process_input_file(filename):
             ofinput.enums[name] = [(x[0], x[1]) for x in members]
         elif s[0] == 'metadata':
             if s[1] == 'version':
-                log("Found version: wire version " + s[2])
+                log("Found version: wire version %s", s[2])
                 if s[2] == 'any':
                     ofinput.wire_versions.update(of_g.wire_ver_map.keys())
                 elif int(s[2]) in of_g.supported_wire_protos:
@@ -417,6 +467,68 @@ def order_and_assign_object_ids():
         of_g.object_id += 1
 
 
+##
+# Class categories, in order of precedence; a class belongs to the first
+# category among its kinds, or to "object" if none applies
+class_categories = ["message", "list", "oxm", "action_id", "action",
+                    "instruction", "meter_band", "hello_elem", "queue_prop",
+                    "table_feature_prop"]
+
+def class_parent(cls):
+    """
+    Return the inheritance super class of cls, or None
+    """
+    for parent, instances in type_maps.inheritance_map.items():
+        if cls.startswith(parent + "_") and \
+                cls[len(parent) + 1:] in instances:
+            return parent
+    return None
+
+def build_class_info():
+    """
+    Compute the class info record of each class
+
+    The class kind predicates in loxi_utils and type_maps are evaluated
+    once per class here; afterwards they are answered from of_g.class_info.
+    """
+
+    ext_versions = of_g.of_version_range + [of_g.VERSION_ANY]
+    for cls in sorted(of_g.unified):
+        kinds = set([kind for kind, compute in loxi_utils.class_kinds
+                     if compute(cls)])
+        category = "object"
+        for name in class_categories:
+            if name in kinds:
+                category = name
+                break
+        entry_type = None
+        if "list" in kinds:
+            entry_type = loxi_utils.list_to_entry_type(cls)
+        var_len = dict([(v, loxi_utils.class_is_var_len(cls, v))
+                        for v in of_g.target_version_list])
+        extension = dict([(v, type_maps.class_is_extension(cls, v))
+                          for v in ext_versions])
+        of_g.class_info[cls] = dict(
+            category=category,
+            kinds=kinds,
+            parent=class_parent(cls),
+            virtual=type_maps.class_is_virtual(cls),
+            var_len=var_len,
+            entry_type=entry_type,
+            experimenter=type_maps.extension_to_experimenter_name(cls),
+            extension=extension)
+
+def prune_classes():
+    """
+    Restrict the classes to those selected by --classes and
+    --exclude-classes (and the classes they depend on)
+    """
+    include, exclude = class_filter.filter_patterns()
+    if not include and not exclude:
+        return
+    selected = class_filter.select_classes(include, exclude)
+    class_filter.prune(selected)
+
 def initialize_versions():
     """
     Create an empty datastructure for each target version.
@@ -432,23 +544,92 @@ def initialize_versions():
         of_g.ordered_classes[wire_version] = []
 
 
+def input_filenames():
+    """
+    Return the sorted list of input files to process
+
+    With --from-ir this is just the IR file.
+    """
+    if of_g.options.from_ir:
+        return [os.path.abspath(of_g.options.from_ir)]
+    input_dir = of_g.options.input_dir or os.path.join(root_dir, "openflow_input")
+    return sorted(glob.glob(os.path.join(input_dir, "*")))
+
+def frontend_source_filenames():
+    """
+    Return the list of source files the front end results depend on
+    """
+    filenames = [os.path.join(root_dir, name) for name in
+                 ["loxigen.py", "of_g.py", "generic_utils.py", "pyparsing.py"]]
+    for subdir in ["loxi_front_end", "loxi_utils"]:
+        filenames.extend(glob.glob("%s/%s/*.py" % (root_dir, subdir)))
+    return filenames
+
+def process_input_file_worker(filename):
+    """
+    Run process_input_file in a --jobs worker
+
+    @returns The OFInput, or None if the file could not be processed (the
+    error has been reported).  Exiting the worker would hang the pool.
+    """
+    try:
+        return process_input_file(filename)
+    except SystemExit:
+        return None
+    finally:
+        sys.stdout.flush()
+        of_g.loxigen_log_file.flush()
+
+def parse_input_files(filenames):
+    """
+    Parse the given input files into parsed_inputs
+
+    With --jobs greater than one the files are parsed and converted to
+    OFInput objects by a pool of worker processes.  The results are
+    merged by read_input in sorted filename order, so they don't depend
+    on which worker finishes first.
+    """
+    mtimes = [os.stat(filename).st_mtime for filename in filenames]
+    if of_g.options.jobs > 1 and len(filenames) > 1:
+        sys.stdout.flush()
+        of_g.loxigen_log_file.flush()
+        pool = multiprocessing.Pool(min(of_g.options.jobs, len(filenames)))
+        try:
+            ofinputs = pool.map(process_input_file_worker, filenames)
+        except:
+            pool.terminate()
+            raise
+        pool.close()
+        pool.join()
+        if None in ofinputs:
+            sys.exit(1)
+    else:
+        ofinputs = map(process_input_file, filenames)
+    for filename, mtime, ofinput in zip(filenames, mtimes, ofinputs):
+        parsed_inputs[filename] = (mtime, ofinput)
+
 def read_input():
     """
     Read in from files given on command line and update global state
 
+    Only the files which are new or were modified since they were last
+    parsed (in watch mode) are parsed again.
+
     @fixme Should select versions to support from command line
     """
 
-    filenames = sorted(glob.glob("%s/openflow_input/*" % root_dir))
+    filenames = input_filenames()
+    parse_input_files([filename for filename in filenames
+                       if filename not in parsed_inputs or
+                       parsed_inputs[filename][0] != os.stat(filename).st_mtime])
 
     for filename in filenames:
-        log("Processing struct file: " + filename)
-        ofinput = process_input_file(filename)
+        ofinput = parsed_inputs[filename][1]
 
         # Populate global state
         for wire_version in ofinput.wire_versions:
             version_name = of_g.of_version_wire2name[wire_version]
-            versions[version_name]['classes'].update(copy.deepcopy(ofinput.classes))
+            versions[version_name]['classes'].update(ofinput.classes)
             of_g.ordered_classes[wire_version].extend(ofinput.ordered_classes)
 
             for enum_name, members in ofinput.enums.items():
@@ -458,6 +639,9 @@ def read_input():
                         member_name, enum_name, value, wire_version,
                         of_g.identifiers, of_g.identifiers_by_group)
 
+    of_g.identifiers_by_value = identifiers.build_value_index(
+        of_g.identifiers, of_g.identifiers_by_group)
+
 def add_extra_classes():
     """
     Add classes that are generated by Python code instead of from the
@@ -496,12 +680,13 @@ def analyze_input():
     # @fixme If we support extended actions in OF 1.3, need to add IDs
     # for them here
 
+    layouts = {}
     for wire_version in of_g.wire_ver_map.keys():
         version_name = of_g.of_version_wire2name[wire_version]
         calculate_offsets_and_lengths(
             of_g.ordered_classes[wire_version],
             versions[version_name]['classes'],
-            wire_version)
+            wire_version, layouts)
 
 def unify_input():
     """
@@ -525,64 +710,439 @@ def log_all_class_info():
     """
     Log the results of processing the input
 
-    Debug function
+    Debug function; only run with --log-level=verbose
     """
 
-    for cls in of_g.unified:
-        for v in of_g.unified[cls]:
+    for cls in sorted(of_g.unified):
+        for v in sorted(of_g.unified[cls]):
             if type(v) == type(0):
-                log("cls: %s. ver: %d. base len %d. %s" %
-                    (str(cls), v, of_g.base_length[(cls, v)],
-                     loxi_utils.class_is_var_len(cls,v) and "not fixed"
-                     or "fixed"))
+                verbose("cls: %s. ver: %d. base len %d. %s",
+                        str(cls), v, of_g.base_length[(cls, v)],
+                        loxi_utils.class_is_var_len(cls,v) and "not fixed"
+                        or "fixed")
                 if "use_version" in of_g.unified[cls][v]:
-                    log("cls %s: v %d mapped to %d" % (str(cls), v,
-                           of_g.unified[cls][v]["use_version"]))
+                    verbose("cls %s: v %d mapped to %d", str(cls), v,
+                            of_g.unified[cls][v]["use_version"])
                 if "members" in of_g.unified[cls][v]:
                     for member in of_g.unified[cls][v]["members"]:
-                        log("   %-20s: type %-20s. offset %3d" %
-                            (member["name"], member["m_type"],
-                             member["offset"]))
+                        verbose("   %-20s: type %-20s. offset %3d",
+                                member["name"], member["m_type"],
+                                member["offset"])
 
-def generate_all_files():
+def run_frontend():
     """
-    Create the files for the language target
+    Run the front end, or restore its results from the cache
+
+    If a cache directory was given on the command line, the results are
+    looked up by a hash of the input files and front end sources and
+    saved there after a cold run.
+
+    With --from-ir the results are loaded from an IR file instead, and
+    with --export-ir they are written to one.
+
+    If classes were selected on the command line, the type_maps tables
+    are restricted to them afterwards.
+    """
+    cache_dir = of_g.options.cache_dir
+    loaded = False
+    if of_g.options.from_ir:
+        try:
+            profiling.timed("phase", "ir_load", ir.load, of_g.options.from_ir)
+        except ir.IRError as e:
+            debug("Error: %s", e)
+            sys.exit(1)
+        loaded = True
+    elif cache_dir:
+        key = frontend_cache.cache_key(input_filenames(),
+                                       frontend_source_filenames())
+        loaded = profiling.timed("phase", "cache_load",
+                                 frontend_cache.load, cache_dir, key)
+
+    if not loaded:
+        for phase in [initialize_versions, read_input, add_extra_classes,
+                      analyze_input, unify_input, build_class_info,
+                      prune_classes, order_and_assign_object_ids]:
+            profiling.timed("phase", phase.__name__, phase)
+
+        if cache_dir:
+            profiling.timed("phase", "cache_save", frontend_cache.save, cache_dir, key)
+
+    if of_g.options.export_ir:
+        profiling.timed("phase", "ir_export", ir.export, of_g.options.export_ir)
+
+    if class_filter.filter_patterns() != ([], []):
+        profiling.timed("phase", "prune_type_maps", class_filter.prune_type_maps)
+
+def reset_frontend():
+    """
+    Discard the front end results so that run_frontend can be run again
+
+    The parsed input files are kept; read_input only parses the ones that
+    changed.  The language module may define a reset function to drop
+    anything it derived from the previous results.
+    """
+    global versions
+    versions = {}
+    frontend_cache.restore(copy.deepcopy(initial_frontend_state))
+    class_filter.restore_type_maps()
+    for backend in lang_backends:
+        reset = getattr(backend, "reset", None)
+        if reset:
+            reset()
+
+def rerun_frontend():
+    """
+    Run the front end again after the input files changed
+
+    If an input file can't be processed (the error has been reported),
+    the previous front end results are restored so that watch can go on
+    with them until the file is fixed.  read_input only records a parsed
+    file once all the modified files have been parsed, so the previously
+    parsed inputs are kept too.
+
+    @returns True if the front end succeeded
+    """
+    global versions
+    previous_state = frontend_cache.capture()
+    previous_versions = versions
+    reset_frontend()
+    try:
+        run_frontend()
+    except SystemExit:
+        reset_frontend()
+        frontend_cache.restore(previous_state)
+        versions = previous_versions
+        if class_filter.filter_patterns() != ([], []):
+            class_filter.prune_type_maps()
+        return False
+    return True
+
+def write_file(path, contents):
+    """
+    Write contents to path, honoring --write-if-changed
+
+    The contents go to a temporary file which is then renamed into place,
+    so readers never see a partially written file.
+
+    @param path The file to write
+    @param contents The complete new contents of the file
+    @returns True if the file was written, False if it was left untouched
+    because it already had the given contents
+    """
+    if of_g.options.write_if_changed and os.path.exists(path):
+        with open(path, "r") as infile:
+            if infile.read() == contents:
+                return False
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            # Another --jobs worker may have just created it
+            if not os.path.isdir(dirname):
+                raise
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp_path, "w") as outfile:
+        outfile.write(contents)
+    os.rename(tmp_path, path)
+    return True
+
+def generate_target(name):
+    """
+    Create the file for a single target of the language module
+
+    The target is rendered into memory first and then handed to
+    write_file.
+
+    With --profile-dir the generator function is run under cProfile and
+    the statistics are saved as <profile-dir>/<name>.prof.
+
+    @param name The target name, relative to the install directory
+    @returns A tuple (name, written, seconds, templates, template_files)
+    where written is False if the existing file was already up to date,
+    seconds is the time taken, templates the number of templates rendered
+    and template_files the sorted list of template files used
+    """
+    start = time.time()
+    templates_start = loxi_utils.templates_rendered
+    loxi_utils.template_files.clear()
+    fn = targets[name]
+    path = of_g.options.install_dir + '/' + name
+    out = StringIO.StringIO()
+    if of_g.options.profile_dir:
+        profiling.profile_call(
+            os.path.join(of_g.options.profile_dir, name + ".prof"),
+            fn, out, os.path.basename(name))
+    else:
+        fn(out, os.path.basename(name))
+    written = write_file(path, out.getvalue())
+    of_g.loxigen_log_file.flush()
+    return (name, written, time.time() - start,
+            loxi_utils.templates_rendered - templates_start,
+            sorted(loxi_utils.template_files))
+
+def generate_target_worker(name):
     """
-    for (name, fn) in lang_module.targets.items():
-        path = of_g.options.install_dir + '/' + name
-        os.system("mkdir -p %s" % os.path.dirname(path))
-        with open(path, "w") as outfile:
-            fn(outfile, os.path.basename(name))
+    Run generate_target in a --jobs worker
+
+    @returns The result of generate_target, or None if the backend exited
+    (the error has been reported).  Exiting the worker would hang the pool.
+    """
+    try:
+        return generate_target(name)
+    except SystemExit:
+        return None
+    finally:
+        sys.stdout.flush()
+        of_g.loxigen_log_file.flush()
+
+def report_target(name, written, seconds, templates, template_files):
+    profiling.record("target", name, seconds)
+    target_templates[name] = template_files
+    if written:
         print("Wrote contents for " + name)
+    else:
+        print("Contents unchanged for " + name)
+
+def generate_all_files(names=None):
+    """
+    Create the files for the language target
+
+    @param names The targets to generate, by default all of them
+
+    Targets are processed in sorted order so that the output (including
+    the log) does not depend on dict iteration order.
+
+    With --jobs greater than one the targets are generated by a pool of
+    worker processes.  The workers are forked after the front end has run
+    so they share its results; each one only receives target names.
+    """
+    if names is None:
+        names = targets.keys()
+    names = sorted(names)
+    if of_g.options.jobs > 1 and len(names) > 1:
+        # Don't let the workers inherit (and later duplicate) buffered output
+        sys.stdout.flush()
+        of_g.loxigen_log_file.flush()
+        pool = multiprocessing.Pool(min(of_g.options.jobs, len(names)))
+        failed = False
+        try:
+            for name, result in itertools.izip(
+                    names, pool.imap(generate_target_worker, names)):
+                if result is None:
+                    debug("Error: failed to generate %s", name)
+                    failed = True
+                    continue
+                # Rendered in the worker, so not counted in this process yet
+                loxi_utils.templates_rendered += result[3]
+                report_target(*result)
+        except:
+            pool.terminate()
+            raise
+        pool.close()
+        pool.join()
+        if failed:
+            sys.exit(1)
+    else:
+        for name in names:
+            report_target(*generate_target(name))
+
+    if of_g.options.dep_dir:
+        profiling.timed("phase", "write_depfiles", write_depfiles, names)
+
+def depfile_escape(filename):
+    """
+    Quote a filename for use in a make rule
+    """
+    return filename.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+def write_depfiles(names):
+    """
+    Write a make depfile for each of the given targets to --dep-dir
+
+    The depfile of a target lists the files it was generated from: the
+    templates it rendered, the input files and the generator's own
+    loaded Python sources (the front end results depend on all of the
+    input files).  As with gcc -MP, each dependency also gets an empty
+    rule so that make does not fail when it is removed.
+
+    @param names The targets to write depfiles for
+    """
+    common = input_filenames() + generator_source_filenames()
+    for name in names:
+        targets = [of_g.options.install_dir + '/' + name]
+        if of_g.options.dep_stamp:
+            targets.append(of_g.options.dep_stamp)
+        targets = map(depfile_escape, targets)
+        deps = map(depfile_escape, sorted(target_templates[name]) + common)
+        rule = " \\\n  ".join([" ".join(targets) + ":"] + deps)
+        empty_rules = "".join(["\n%s:\n" % dep for dep in deps])
+        write_file(os.path.join(of_g.options.dep_dir, name + ".d"),
+                   rule + "\n" + empty_rules)
+
+def generator_source_filenames():
+    """
+    Return the generator's Python source files that have been loaded
+    """
+    filenames = set()
+    for module in sys.modules.values():
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            continue
+        filename = os.path.realpath(filename)
+        if not filename.startswith(root_dir + os.sep):
+            continue
+        if filename.endswith(".pyc") or filename.endswith(".pyo"):
+            filename = filename[:-1]
+        filenames.add(filename)
+    return sorted(filenames)
+
+def file_mtimes(filenames):
+    """
+    Return a dict from filename to mtime, or None if the file is missing
+    """
+    mtimes = {}
+    for filename in filenames:
+        try:
+            mtimes[filename] = os.stat(filename).st_mtime
+        except OSError:
+            mtimes[filename] = None
+    return mtimes
+
+def used_template_filenames():
+    """
+    Return the set of template files used by the targets generated so far
+    """
+    filenames = set()
+    for template_files in target_templates.values():
+        filenames.update(template_files)
+    return filenames
+
+def watch():
+    """
+    Poll the input files, templates and generator sources for changes
+
+    The front end results, parsed input files and compiled templates stay
+    in memory between regenerations:
+
+    - When an input file is added, removed or modified, the front end is
+      run again (parsing only the modified files) and all targets are
+      regenerated.  If an input file has errors, the outputs and front
+      end results of the previous run are kept.
+    - When a template is modified, only the targets that used it are
+      regenerated.
+    - When one of the generator's own Python sources is modified, the
+      generator restarts itself.
+
+    Files are compared by mtime, so no file notification API is needed.
+    Runs until interrupted.
+    """
+    sources = file_mtimes(generator_source_filenames())
+    inputs = file_mtimes(input_filenames())
+    templates = file_mtimes(used_template_filenames())
+    print "Watching for changes every %gs" % of_g.options.watch_interval
+    sys.stdout.flush()
+    while True:
+        time.sleep(of_g.options.watch_interval)
+        if file_mtimes(sources) != sources:
+            print "Generator sources changed, restarting"
+            sys.stdout.flush()
+            of_g.loxigen_log_file.flush()
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+        new_inputs = file_mtimes(input_filenames())
+        new_templates = file_mtimes(templates)
+        changed_templates = set([filename for filename in templates
+                                 if new_templates[filename] != templates[filename]])
+        if new_inputs != inputs:
+            changed_inputs = [filename for filename in
+                              sorted(set(inputs) | set(new_inputs))
+                              if inputs.get(filename) != new_inputs.get(filename)]
+            print "Input files changed: %s" % \
+                " ".join([os.path.basename(x) for x in changed_inputs])
+            for filename in changed_inputs:
+                if filename not in new_inputs:
+                    parsed_inputs.pop(filename, None)
+            if not rerun_frontend():
+                print "Keeping the previous outputs until the input files are fixed"
+                sys.stdout.flush()
+                inputs = new_inputs
+                continue
+            loxi_utils.template_engines.clear()
+            names = None
+        elif changed_templates:
+            print "Templates changed: %s" % \
+                " ".join([os.path.basename(x) for x in sorted(changed_templates)])
+            loxi_utils.template_engines.clear()
+            names = [name for name, template_files in target_templates.items()
+                     if changed_templates.intersection(template_files)]
+        else:
+            continue
+
+        generate_all_files(names)
+        inputs = new_inputs
+        templates = new_templates
+        templates.update(file_mtimes(used_template_filenames() - set(templates)))
+        sys.stdout.flush()
 
 if __name__ == '__main__':
     of_g.loxigen_log_file = open("loxigen.log", "w")
     of_g.loxigen_dbg_file = sys.stdout
 
     of_g.process_commandline()
-    # @fixme Use command line params to select log
+    of_g.loxigen_log_level = log_level_names.index(of_g.options.log_level)
+    of_g.loxigen_log_format = of_g.options.log_format
 
     if not config_sanity_check():
         debug("Config sanity check failed\n")
         sys.exit(1)
 
-    # Import the language file
-    lang_file = "lang_%s" % of_g.options.lang
-    lang_module = __import__(lang_file)
+    # Load the backends of the selected languages
+    for module in of_g.options.backend_modules:
+        __import__(module)
+    for lang in of_g.options.langs:
+        backend = backends.get_backend(lang)
+        for name, fn in backend.targets.items():
+            if name in targets:
+                debug("Error: %s is a target of more than one language", name)
+                sys.exit(1)
+            targets[name] = fn
+        lang_backends.append(backend)
 
     # If list files, just list auto-gen files to stdout and exit
     if of_g.options.list_files:
-        for name in lang_module.targets:
+        for name in sorted(targets):
             print of_g.options.install_dir + '/' + name
         sys.exit(0)
 
-    log("\nGenerating files for target language %s\n" % of_g.options.lang)
-
-    initialize_versions()
-    read_input()
-    add_extra_classes()
-    analyze_input()
-    unify_input()
-    order_and_assign_object_ids()
-    log_all_class_info()
-    generate_all_files()
+    log("\nGenerating files for target languages %s\n",
+        ", ".join(of_g.options.langs))
+
+    loxi_utils.template_cache_dir = of_g.options.template_cache_dir
+
+    if of_g.options.watch:
+        of_g.options.write_if_changed = True
+        initial_frontend_state = copy.deepcopy(frontend_cache.capture())
+
+    start = time.time()
+    run_frontend()
+    frontend_seconds = time.time() - start
+    if log_enabled(LOG_VERBOSE):
+        profiling.timed("phase", "log_all_class_info", log_all_class_info)
+    if not of_g.options.frontend_only:
+        generate_all_files()
+
+    if of_g.options.profile:
+        result = profiling.report(sys.stdout, time.time() - start,
+                                  loxi_utils.templates_rendered,
+                                  dict(lang=of_g.options.lang,
+                                       jobs=of_g.options.jobs,
+                                       frontend_seconds=frontend_seconds))
+        profiling.save(of_g.options.profile_output, result)
+        print("Wrote profile to " + of_g.options.profile_output)
+
+    if of_g.options.watch:
+        try:
+            watch()
+        except KeyboardInterrupt:
+            pass
@@ -61,6 +61,17 @@ options_default = {
     "lang"               : "c",
     "version-list"       : "1.0 1.1 1.2 1.3",
     "install-dir"        : "loxi_output",
+    "input-dir"          : None,
+    "parser"             : "fast",
+    "cache-dir"          : None,
+    "template-cache-dir" : None,
+    "jobs"               : 1,
+    "profile-output"     : "loxigen-profile.json",
+    "profile-dir"        : None,
+    "dep-dir"            : None,
+    "watch-interval"     : 1.0,
+    "log-level"          : "info",
+    "log-format"         : "text",
 }
 
 ##
@@ -73,6 +84,12 @@ def lang_normalize(lang):
     """
     return lang.lower()
 
+def lang_list_normalize(langs):
+    """
+    Normalize a comma separated list of languages and return as an array
+    """
+    return [lang_normalize(x.strip()) for x in langs.split(",") if x.strip()]
+
 def version_list_normalize(vlist):
     """
     Normalize the version list and return as an array
@@ -111,17 +128,73 @@ def process_commandline(default_vals=options_default):
                       help="List output files generated")
     parser.add_option("-l", "--lang", "--language",
                       default=default_vals["lang"],
-                      help="Select the target language: c, python")
+                      help="Select the target languages, comma separated: c, python, java")
+    parser.add_option("--backend-module", action="append", dest="backend_modules",
+                      default=[],
+                      help="Import this module, which registers additional backends (may be repeated)")
     parser.add_option("-i", "--install-dir",
                       default=default_vals["install-dir"],
                       help="Directory to install generated files to (default %s)" % default_vals["install-dir"])
+    parser.add_option("--input-dir",
+                      default=default_vals["input-dir"],
+                      help="Directory of input files to process (default: openflow_input in the source tree)")
     parser.add_option("-v", "--version-list",
                       default=default_vals["version-list"],
                       help="Specify the versions to target as 1.0 1.1 etc")
+    parser.add_option("--parser", type="choice", choices=["fast", "pyparsing"],
+                      default=default_vals["parser"],
+                      help="Select the input file parser: fast, pyparsing (default %s)" % default_vals["parser"])
+    parser.add_option("--cache-dir",
+                      default=default_vals["cache-dir"],
+                      help="Directory used to cache front end results between runs (default: no caching)")
+    parser.add_option("--template-cache-dir",
+                      default=default_vals["template-cache-dir"],
+                      help="Directory used to cache compiled templates between runs (default: memory only)")
+    parser.add_option("--export-ir",
+                      help="Write the front end results to this IR file (JSON if it ends in .json, otherwise a faster binary encoding)")
+    parser.add_option("--from-ir",
+                      help="Load the front end results from this IR file instead of processing the input files")
+    parser.add_option("--frontend-only", action="store_true", default=False,
+                      help="Only run the front end (with --export-ir, or to time it with --profile)")
+    parser.add_option("--write-if-changed", action="store_true", default=False,
+                      help="Only replace generated files whose contents changed")
+    parser.add_option("--profile", action="store_true", default=False,
+                      help="Report the time taken by each phase and target")
+    parser.add_option("--profile-output",
+                      default=default_vals["profile-output"],
+                      help="Where --profile saves its results as JSON (default %s)" % default_vals["profile-output"])
+    parser.add_option("--profile-dir",
+                      default=default_vals["profile-dir"],
+                      help="Save cProfile statistics for each target in this directory")
+    parser.add_option("-j", "--jobs", type="int",
+                      default=default_vals["jobs"],
+                      help="Number of processes used to parse the input files and generate targets (default %d)" % default_vals["jobs"])
+    parser.add_option("--dep-dir",
+                      default=default_vals["dep-dir"],
+                      help="Write a make depfile <target>.d for each generated file to this directory")
+    parser.add_option("--dep-stamp",
+                      help="Also make this file (e.g. a Makefile stamp) depend on the dependencies in each depfile")
+    parser.add_option("--classes",
+                      help="Only generate these classes (and the classes they depend on); comma separated list of class name globs and categories, e.g. of_bsn_*,actions")
+    parser.add_option("--exclude-classes",
+                      help="Do not generate these classes unless another class depends on them; same syntax as --classes")
+    parser.add_option("--log-level", type="choice",
+                      choices=["error", "info", "verbose"],
+                      default=default_vals["log-level"],
+                      help="Messages to write to loxigen.log: error, info or verbose, which includes the details of every class (default %s)" % default_vals["log-level"])
+    parser.add_option("--log-format", type="choice", choices=["text", "json"],
+                      default=default_vals["log-format"],
+                      help="Format of loxigen.log: text, or json with one object per message (default %s)" % default_vals["log-format"])
+    parser.add_option("--watch", action="store_true", default=False,
+                      help="Keep running and regenerate the affected files when an input file or template changes (implies --write-if-changed)")
+    parser.add_option("--watch-interval", type="float",
+                      default=default_vals["watch-interval"],
+                      help="Seconds between checks for changes in watch mode (default %g)" % default_vals["watch-interval"])
 
     (options, args) = parser.parse_args()
 
     options.lang = lang_normalize(options.lang)
+    options.langs = lang_list_normalize(options.lang)
     target_version_list = version_list_normalize(options.version_list)
     target_version_list.sort()
     return (options, args)
@@ -363,6 +436,13 @@ identifiers = {}
 
 identifiers_by_group = {}
 
+##
+# Reverse index of identifiers.  Indexed by (ofp_group, version, value);
+# the value is the ofp_name of the identifier.  Built after all input files
+# have been read; see identifiers.build_value_index.
+
+identifiers_by_value = {}
+
 ## Ordered list of class names
 # This is per-wire-version and is a list of the classes in the order
 # they appear in the file.  That is important because of the assumption
@@ -403,6 +483,17 @@ object_id = 1  # Reserve 0 for root object
 ## The unified view of all classes.  See internal readme.
 unified = {}
 
+## Index of the distinct wire layouts of each class.  Indexed by class
+# name; the value is a dict from class signature (see
+# loxi_utils.class_signature) to the wire version defining that layout.
+class_signatures = {}
+
+## Per class record of the class kind, inheritance parent, variable
+# length per version, list entry type and extension status, computed once
+# by the front end.  Indexed by class name; see build_class_info in
+# loxigen.py.  Pseudo objects are not included.
+class_info = {}
+
 ## Indicates data members with non-fixed start offsets
 # Indexed by (cls, version, member-name) and value is prev-member-name
 special_offsets = {}
@@ -507,6 +598,13 @@ def experimenter_name_lookup(experimenter_id):
 loxigen_dbg_file = sys.stdout
 loxigen_log_file = sys.stdout
 
+##
+# The messages written to loxigen_log_file: those at or below this level
+# (see the LOG_ constants in generic_utils) in the given format, "text" or
+# "json" (one object per line)
+loxigen_log_level = 1
+loxigen_log_format = "text"
+
 ################################################################
 #
 # Internal representation
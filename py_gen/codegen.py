@@ -41,6 +41,10 @@ FieldLengthMember = namedtuple('FieldLengthMember', ['name', 'oftype', 'field_na
 TypeMember = namedtuple('TypeMember', ['name', 'oftype', 'value'])
 PadMember = namedtuple('PadMember', ['length'])
 
+# The pieces pack_into() writes and unpack() reads, see pack_plan
+PackStruct = namedtuple('PackStruct', ['name', 'fmt', 'args', 'members', 'offsets'])
+PackValue = namedtuple('PackValue', ['name', 'stmt', 'length', 'member'])
+
 # XXX move to frontend
 field_length_members = {
     ('of_packet_out', 1, 'actions_len') : 'actions',
@@ -98,28 +102,53 @@ def get_type_values(cls, version):
 
     return type_values
 
+def class_category(cls):
+    """
+    Returns the name of the generated module a class belongs in.
+    """
+    if utils.class_is_message(cls):
+        return 'message'
+    elif utils.class_is_action(cls):
+        return 'action'
+    elif utils.class_is_instruction(cls):
+        return 'instruction'
+    elif utils.class_is_meter_band(cls):
+        return 'meter_band'
+    elif utils.class_is_oxm(cls):
+        return 'oxm'
+    elif utils.class_is_list(cls):
+        return 'list'
+    else:
+        return 'common'
+
 # Create intermediate representation
 def build_ofclasses(version):
+    """
+    Returns a dict from category (see class_category) to the list of
+    OFClasses in that category, in standard class order.
+    """
     blacklist = ["of_action", "of_action_header", "of_header", "of_queue_prop",
                  "of_queue_prop_header", "of_experimenter", "of_action_experimenter",
                  "of_oxm", "of_oxm_header", "of_oxm_experimenter_header",
                  "of_hello_elem", "of_hello_elem_header"]
-    ofclasses = []
+    ofclasses = dict(message=[], action=[], instruction=[], meter_band=[],
+                     oxm=[], list=[], common=[])
     for cls in of_g.standard_class_order:
         if type_maps.class_is_virtual(cls):
             continue
         if version not in of_g.unified[cls] or cls in blacklist:
             continue
         unified_class = util.lookup_unified_class(cls, version)
+        category = class_category(cls)
 
         # Name for the generated Python class
-        if utils.class_is_action(cls):
+        if category == 'action':
             pyname = cls[10:]
-        elif utils.class_is_oxm(cls):
+        elif category == 'oxm':
             pyname = cls[7:]
-        elif utils.class_is_meter_band(cls):
+        elif category == 'meter_band':
             pyname = cls[14:]
-        elif utils.class_is_instruction(cls):
+        elif category == 'instruction':
             pyname = cls[15:]
         else:
             pyname = cls[3:]
@@ -154,7 +183,7 @@ def build_ofclasses(version):
                 members.append(Member(name=member['name'],
                                       oftype=oftype.OFType(member['m_type'], version)))
 
-        ofclasses.append(
+        ofclasses[category].append(
             OFClass(name=cls,
                     pyname=pyname,
                     members=members,
@@ -163,27 +192,174 @@ def build_ofclasses(version):
                     is_fixed_length=(cls, version) in of_g.is_fixed_length))
     return ofclasses
 
+def pack_plan(ofclass):
+    """
+    Returns the list of pieces the pack_into() method of ofclass writes.
+
+    Runs of adjacent members with a fixed size struct format (including
+    pads, type and length fields) are coalesced into a PackStruct, written
+    using a module level struct.Struct with the given name.  offsets gives
+    the position of each of its members within the struct.  Other members
+    are a PackValue, written to the OFWriter "writer" by the statement
+    stmt.  length is an expression for its packed length if that is known
+    without packing it, or else None.
+
+    If the length of the object is known its length member is passed the
+    size, or the local variable "length" computed before packing.
+    Otherwise the length member is written as 0 (and likewise a field
+    length member of a field of unknown length) and patched once the
+    object or the field has been written.
+
+    unpack() reads each PackStruct with a single call to the same
+    struct.Struct; members lists the non-pad members it covers.
+    """
+    plan = []
+    num_structs = 0
+    fmt = ""
+    args = []
+    members = []
+    offsets = []
+    values = dict([(m.name, m.oftype.gen_pack_length('self.' + m.name))
+                   for m in ofclass.members
+                   if type(m) != PadMember and
+                   not m.oftype.gen_pack_struct('self.' + m.name)])
+    if not values:
+        static_length = struct.calcsize("!" + ''.join(
+            [type(m) == PadMember and "%dx" % m.length or
+             m.oftype.gen_pack_struct('self.' + m.name)[0]
+             for m in ofclass.members]))
+    for m in ofclass.members:
+        if type(m) == PadMember:
+            fmt += "%dx" % m.length
+            continue
+        packing = m.oftype.gen_pack_struct('self.' + m.name)
+        if packing:
+            member_fmt, member_args = packing
+            if type(m) == LengthMember:
+                if not values:
+                    member_args = [str(static_length)]
+                elif None in values.values():
+                    member_args = ['0']
+                else:
+                    member_args = ['length']
+            elif type(m) == FieldLengthMember:
+                assert m.field_name in values
+                member_args = [values[m.field_name] or '0']
+            offsets.append(struct.calcsize("!" + fmt))
+            fmt += member_fmt
+            args.extend(member_args)
+            members.append(m)
+        else:
+            if fmt:
+                name = "_%s_struct%d" % (ofclass.pyname, num_structs)
+                plan.append(PackStruct(name=name, fmt="!" + fmt, args=args,
+                                       members=members, offsets=offsets))
+                num_structs += 1
+                fmt = ""
+                args = []
+                members = []
+                offsets = []
+            plan.append(PackValue(name="_" + m.name,
+                                  stmt=m.oftype.gen_pack_into('self.' + m.name, 'writer'),
+                                  length=values[m.name],
+                                  member=m))
+    if fmt:
+        name = "_%s_struct%d" % (ofclass.pyname, num_structs)
+        plan.append(PackStruct(name=name, fmt="!" + fmt, args=args,
+                               members=members, offsets=offsets))
+    return plan
+
+def unpack_steps(ofclass):
+    """
+    Returns the statements unpack() uses to read the members of ofclass
+    from the OFReader "reader" into "obj".
+
+    The result is a list of steps (members, statements), where members
+    lists the names of the normal members the step sets.  Messages
+    unpacked lazily decode one step at a time.  A field length member is
+    read in the same step as its field, and pads with the members before
+    them.
+    """
+    steps = []
+    field_length_members = {}
+    # Fields whose field length member has been read but not the field
+    pending_fields = set()
+    for p in pack_plan(ofclass):
+        merge = bool(pending_fields)
+        members = []
+        stmts = []
+        if type(p) == PackStruct:
+            targets = []
+            values = []
+            asserts = []
+            for m in p.members:
+                if type(m) == Member:
+                    member_targets, value = \
+                        m.oftype.gen_unpack_struct('obj.' + m.name, '_' + m.name)
+                    targets.extend(member_targets)
+                    if value:
+                        values.append(('obj.' + m.name, value))
+                    members.append(m.name)
+                else:
+                    targets.append('_' + m.name)
+                    if type(m) == FieldLengthMember:
+                        field_length_members[m.field_name] = m
+                        pending_fields.add(m.field_name)
+                    elif type(m) == TypeMember:
+                        asserts.append('_%s == %s' % (m.name, m.value))
+            if not targets:
+                stmts.append('reader.skip(%d)' % struct.calcsize(p.fmt))
+            elif len(targets) == 1:
+                stmts.append('%s, = reader.read_struct(%s)' % (targets[0], p.name))
+            else:
+                stmts.append('%s = reader.read_struct(%s)' % (', '.join(targets), p.name))
+            stmts.extend(['%s = %s' % (target, value) for (target, value) in values])
+            stmts.extend(['assert(%s)' % expr for expr in asserts])
+        else:
+            m = p.member
+            if m.name in field_length_members:
+                reader_expr = 'reader.slice(_%s)' % field_length_members[m.name].name
+            else:
+                reader_expr = 'reader'
+            stmts.append('obj.%s = %s' % (m.name, m.oftype.gen_unpack_expr(reader_expr)))
+            members.append(m.name)
+            pending_fields.discard(m.name)
+        if merge or (steps and not members):
+            steps[-1][0].extend(members)
+            steps[-1][1].extend(stmts)
+        else:
+            steps.append((members, stmts))
+    if ofclass.name == 'of_match_v3':
+        steps[-1][1].append('reader.skip((_length + 7)/8*8 - _length)')
+    return steps
+
+# Cache of build_ofclasses results, indexed by version
+ofclasses_cache = {}
+
+def get_ofclasses(version, category):
+    """
+    Returns the OFClasses in the given category for a version.
+
+    The class model for each version is only built once and shared by all
+    the generate_* functions.
+    """
+    if version not in ofclasses_cache:
+        ofclasses_cache[version] = build_ofclasses(version)
+    return ofclasses_cache[version][category]
+
 def generate_init(out, name, version):
     util.render_template(out, 'init.py', version=version)
 
 def generate_action(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if utils.class_is_action(x.name)]
+    ofclasses = get_ofclasses(version, 'action')
     util.render_template(out, 'action.py', ofclasses=ofclasses, version=version)
 
 def generate_oxm(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if utils.class_is_oxm(x.name)]
+    ofclasses = get_ofclasses(version, 'oxm')
     util.render_template(out, 'oxm.py', ofclasses=ofclasses, version=version)
 
 def generate_common(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if not utils.class_is_message(x.name)
-                    and not utils.class_is_action(x.name)
-                    and not utils.class_is_instruction(x.name)
-                    and not utils.class_is_meter_band(x.name)
-                    and not utils.class_is_oxm(x.name)
-                    and not utils.class_is_list(x.name)]
+    ofclasses = get_ofclasses(version, 'common')
     util.render_template(out, 'common.py', ofclasses=ofclasses, version=version)
 
 def generate_const(out, name, version):
@@ -199,18 +375,15 @@ def generate_const(out, name, version):
     util.render_template(out, 'const.py', version=version, groups=groups)
 
 def generate_instruction(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if utils.class_is_instruction(x.name)]
+    ofclasses = get_ofclasses(version, 'instruction')
     util.render_template(out, 'instruction.py', ofclasses=ofclasses, version=version)
 
 def generate_message(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if utils.class_is_message(x.name)]
+    ofclasses = get_ofclasses(version, 'message')
     util.render_template(out, 'message.py', ofclasses=ofclasses, version=version)
 
 def generate_meter_band(out, name, version):
-    ofclasses = [x for x in build_ofclasses(version)
-                 if utils.class_is_meter_band(x.name)]
+    ofclasses = get_ofclasses(version, 'meter_band')
     util.render_template(out, 'meter_band.py', ofclasses=ofclasses, version=version)
 
 def generate_pp(out, name, version):
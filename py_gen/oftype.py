@@ -109,6 +109,81 @@ class OFType(object):
     def _gen_string_pack_expr(self, length, expr_expr):
         return 'struct.pack("!%ds", %s)' % (length, expr_expr)
 
+    def gen_pack_into(self, expr_expr, writer_expr):
+        """
+        Returns a statement writing the value of expr_expr to the OFWriter
+        writer_expr.
+        """
+        if self.base == 'of_octets_t':
+            return '%s += %s' % (writer_expr, expr_expr)
+        elif utils.class_is_list(self.base):
+            return '%s.write_list(%s)' % (writer_expr, expr_expr)
+        elif self.base in ['of_match_t', 'of_port_desc_t', 'of_meter_features_t']:
+            return '%s.pack_into(%s)' % (expr_expr, writer_expr)
+        else:
+            return '%s += %s' % (writer_expr, self.gen_pack_expr(expr_expr))
+
+    def gen_pack_length(self, expr_expr):
+        """
+        Returns an expression for the packed length of the value of
+        expr_expr if it is known without packing it, or else None.
+        """
+        if self.base == 'of_octets_t':
+            return 'len(%s)' % expr_expr
+        else:
+            return None
+
+    def gen_pack_struct(self, expr_expr):
+        """
+        Returns (fmt, args) if values of this type are packed by a struct
+        format: fmt is the format (without byte order) and args the list
+        of argument expressions.  Returns None for other types.
+        """
+        pack_fmt = self._pack_fmt()
+        if pack_fmt and not self.is_array:
+            return (pack_fmt, [expr_expr])
+        elif pack_fmt and self.is_array:
+            return ("%d%s" % (self.array_length, pack_fmt),
+                    ["%s[%d]" % (expr_expr, i) for i in range(self.array_length)])
+        elif self.base == 'of_mac_addr_t':
+            return ("6B", ["%s[%d]" % (expr_expr, i) for i in range(6)])
+        elif self.base == 'of_ipv6_t':
+            return ("16s", [expr_expr])
+        elif self.base == 'of_port_name_t':
+            return ("16s", [expr_expr])
+        elif self.base == 'of_table_name_t' or self.base == 'of_serial_num_t':
+            return ("32s", [expr_expr])
+        elif self.base == 'of_desc_str_t':
+            return ("256s", [expr_expr])
+        else:
+            return None
+
+    def gen_unpack_struct(self, target_expr, temp_name):
+        """
+        Counterpart of gen_pack_struct. Returns (targets, value) where
+        targets is the list of names the struct fields are unpacked into
+        and value is None if target_expr is the only target, or else the
+        expression to assign to target_expr afterwards.  temp_name is used
+        to name the temporary targets.
+        """
+        pack_fmt = self._pack_fmt()
+        if pack_fmt and not self.is_array:
+            return ([target_expr], None)
+        elif (pack_fmt and self.is_array) or self.base == 'of_mac_addr_t':
+            if self.base == 'of_mac_addr_t':
+                count = 6
+            else:
+                count = self.array_length
+            targets = ["%s_%d" % (temp_name, i) for i in range(count)]
+            return (targets, "[%s]" % ', '.join(targets))
+        elif self.base == 'of_ipv6_t':
+            return ([target_expr], None)
+        elif self.base in ['of_port_name_t', 'of_table_name_t',
+                           'of_serial_num_t', 'of_desc_str_t']:
+            return ([temp_name], '%s.rstrip("\\x00")' % temp_name)
+        else:
+            return None
+
     def gen_unpack_expr(self, reader_expr):
         pack_fmt = self._pack_fmt()
         if pack_fmt and not self.is_array:
@@ -116,7 +191,7 @@ class OFType(object):
         elif pack_fmt and self.is_array:
             return "list(%s.read('!%d%s'))" % (self.array_length, pack_fmt)
         elif self.base == 'of_octets_t':
-            return "str(%s.read_all())" % (reader_expr)
+            return "%s.read_all().tobytes()" % (reader_expr)
         elif self.base == 'of_mac_addr_t':
             return "list(%s.read('!6B'))" % (reader_expr)
         elif self.base == 'of_ipv6_t':
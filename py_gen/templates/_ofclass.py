@@ -1,6 +1,12 @@
 :: from py_gen.codegen import Member, LengthMember, TypeMember
 :: normal_members = [m for m in ofclass.members if type(m) == Member]
+:: include("_pack_structs.py", ofclass=ofclass)
 class ${ofclass.pyname}(${superclass}):
+    __slots__ = [${', '.join([repr(m.name) for m in normal_members])}]
+:: if superclass == "object":
+    __getstate__ = loxi.generic_util.get_slots_state
+    __setstate__ = loxi.generic_util.set_slots_state
+:: #endif
 :: for m in ofclass.type_members:
     ${m.name} = ${m.value}
 :: #endfor
@@ -14,10 +20,7 @@ class ${ofclass.pyname}(${superclass}):
 :: #endfor
         return
 
-    def pack(self):
-        packed = []
 :: include("_pack.py", ofclass=ofclass)
-        return ''.join(packed)
 
     @staticmethod
     def unpack(buf):
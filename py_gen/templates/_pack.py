@@ -25,38 +25,76 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
-:: # TODO coalesce format strings
-:: from py_gen.codegen import Member, LengthMember, FieldLengthMember, TypeMember, PadMember
-:: length_member = None
-:: length_member_index = None
-:: field_length_members = {}
-:: field_length_indexes = {}
-:: index = 0
-:: for m in ofclass.members:
-::     if type(m) == LengthMember:
-::         length_member = m
-::         length_member_index = index
-        packed.append(${m.oftype.gen_pack_expr('0')}) # placeholder for ${m.name} at index ${index}
-::     elif type(m) == FieldLengthMember:
-::         field_length_members[m.field_name] = m
-::         field_length_indexes[m.field_name] = index
-        packed.append(${m.oftype.gen_pack_expr('0')}) # placeholder for ${m.name} at index ${index}
-::     elif type(m) == PadMember:
-        packed.append('\x00' * ${m.length})
+:: import struct
+:: from py_gen.codegen import LengthMember, FieldLengthMember, pack_plan, PackStruct, PackValue
+:: plan = pack_plan(ofclass)
+:: values = [p for p in plan if type(p) == PackValue]
+:: length_members = [m for m in ofclass.members if type(m) == LengthMember]
+:: needs_length = length_members or ofclass.name == 'of_match_v3'
+:: known_length = not [p for p in values if p.length == None]
+:: if not values:
+    def pack(self):
+::     if plan:
+        return ${plan[0].name}.pack(${', '.join(plan[0].args)})
 ::     else:
-        packed.append(${m.oftype.gen_pack_expr('self.' + m.name)})
-::         if m.name in field_length_members:
-::             field_length_member = field_length_members[m.name]
-::             field_length_index = field_length_indexes[m.name]
-        packed[${field_length_index}] = ${field_length_member.oftype.gen_pack_expr('len(packed[-1])')}
+        return ''
+::     #endif
+:: else:
+    def pack(self):
+        writer = loxi.generic_util.OFWriter()
+        self.pack_into(writer)
+        return str(writer)
+:: #endif
+
+    def pack_into(self, writer):
+:: if not plan:
+        pass
+:: #endif
+:: if values and needs_length and known_length:
+::     static_length = sum([struct.calcsize(p.fmt) for p in plan if type(p) == PackStruct])
+        length = ${' + '.join([str(static_length)] + [p.length for p in values])}
+:: elif values and needs_length:
+        start = len(writer)
+:: #endif
+:: # Offset expressions of the length fields to patch, indexed by member name
+:: patch_offsets = {}
+:: static_offset = 0
+:: for p in plan:
+::     if type(p) == PackStruct:
+::         for (m, offset, arg) in zip(p.members, p.offsets, p.args):
+::             if type(m) in [LengthMember, FieldLengthMember] and arg == '0':
+::                 if static_offset != None:
+::                     patch_offsets[m.name] = "start + %d" % (static_offset + offset)
+::                 else:
+::                     patch_offsets[m.name] = "_%s_offset" % m.name
+        _${m.name}_offset = len(writer) + ${offset}
+::                 #endif
+::             #endif
+::         #endfor
+        writer += ${p.name}.pack(${', '.join(p.args)})
+::         if static_offset != None:
+::             static_offset += struct.calcsize(p.fmt)
 ::         #endif
+::     else:
+::         field_length_member = ([m for m in ofclass.members if type(m) == FieldLengthMember and m.field_name == p.member.name and m.name in patch_offsets] or [None])[0]
+::         if field_length_member:
+        ${p.name}_start = len(writer)
+::         #endif
+        ${p.stmt}
+::         if field_length_member:
+        struct.pack_into("!${field_length_member.oftype.gen_pack_struct('')[0]}", writer, ${patch_offsets[field_length_member.name]}, len(writer) - ${p.name}_start)
+::         #endif
+::         static_offset = None
 ::     #endif
-::     index += 1
 :: #endfor
-:: if length_member_index != None:
-        length = sum([len(x) for x in packed])
-        packed[${length_member_index}] = ${length_member.oftype.gen_pack_expr('length')}
+:: if values and needs_length and not known_length:
+        length = len(writer) - start
 :: #endif
+:: for m in length_members:
+::     if m.name in patch_offsets:
+        struct.pack_into("!${m.oftype.gen_pack_struct('')[0]}", writer, ${patch_offsets[m.name]}, length)
+::     #endif
+:: #endfor
 :: if ofclass.name == 'of_match_v3':
-        packed.append('\x00' * ((length + 7)/8*8 - length))
+        writer += '\x00' * ((length + 7)/8*8 - length)
 :: #endif
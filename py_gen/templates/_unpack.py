@@ -25,33 +25,13 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
-:: # TODO coalesce format strings
-:: from py_gen.codegen import Member, LengthMember, FieldLengthMember, TypeMember, PadMember
+:: from py_gen.codegen import unpack_steps
         if type(buf) == loxi.generic_util.OFReader:
             reader = buf
         else:
             reader = loxi.generic_util.OFReader(buf)
-:: field_length_members = {}
-:: for m in ofclass.members:
-::     if type(m) == PadMember:
-        reader.skip(${m.length})
-::     elif type(m) == LengthMember:
-        _${m.name} = ${m.oftype.gen_unpack_expr('reader')}
-::     elif type(m) == FieldLengthMember:
-::         field_length_members[m.field_name] = m
-        _${m.name} = ${m.oftype.gen_unpack_expr('reader')}
-::     elif type(m) == TypeMember:
-        _${m.name} = ${m.oftype.gen_unpack_expr('reader')}
-        assert(_${m.name} == ${m.value})
-::     elif type(m) == Member:
-::         if m.name in field_length_members:
-::             reader_expr = 'reader.slice(_%s)' % field_length_members[m.name].name
-::         else:
-::             reader_expr = 'reader'
-::         #endif
-        obj.${m.name} = ${m.oftype.gen_unpack_expr(reader_expr)}
-::     #endif
+:: for (members, stmts) in unpack_steps(ofclass):
+::     for stmt in stmts:
+        ${stmt}
+::     #endfor
 :: #endfor
-:: if ofclass.name == 'of_match_v3':
-        reader.skip((_length + 7)/8*8 - _length)
-:: #endif
@@ -45,8 +45,10 @@ def unpack_list(reader):
     return loxi.generic_util.unpack_list_tlv16(reader, deserializer)
 
 class Action(object):
+    __slots__ = []
     type = None # override in subclass
-    pass
+    __getstate__ = loxi.generic_util.get_slots_state
+    __setstate__ = loxi.generic_util.set_slots_state
 
 :: for ofclass in ofclasses:
 :: include('_ofclass.py', ofclass=ofclass, superclass="Action")
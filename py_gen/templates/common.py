@@ -25,6 +25,7 @@
 :: # EPL for the specific language governing permissions and limitations
 :: # under the EPL.
 ::
+:: import of_g
 :: include('_copyright.py')
 
 :: include('_autogen.py')
@@ -54,10 +55,14 @@ def unpack_list_flow_stats_entry(reader):
 
 def unpack_list_queue_prop(reader):
     def deserializer(reader, typ):
+:: if "of_queue_prop_min_rate" in of_g.unified:
         if typ == const.OFPQT_MIN_RATE:
             return queue_prop_min_rate.unpack(reader)
         else:
             raise loxi.ProtocolError("unknown queue prop %d" % typ)
+:: else:
+        raise loxi.ProtocolError("unknown queue prop %d" % typ)
+:: #endif
     return loxi.generic_util.unpack_list_tlv16(reader, deserializer)
 
 def unpack_list_packet_queue(reader):
@@ -68,10 +73,14 @@ def unpack_list_packet_queue(reader):
 
 def unpack_list_hello_elem(reader):
     def deserializer(reader, typ):
+:: if "of_hello_elem_versionbitmap" in of_g.unified:
         if typ == const.OFPHET_VERSIONBITMAP:
             return hello_elem_versionbitmap.unpack(reader)
         else:
             return None
+:: else:
+        return None
+:: #endif
     return [x for x in loxi.generic_util.unpack_list_tlv16(reader, deserializer) if x != None]
 
 def unpack_list_bucket(reader):
@@ -35,6 +35,120 @@ Utility functions independent of the protocol version
 import loxi
 import struct
 
+# Cache of compiled struct.Struct objects, indexed by format string
+struct_cache = {}
+
+def get_struct(fmt):
+    """
+    Return the compiled struct.Struct for fmt
+    """
+    st = struct_cache.get(fmt)
+    if st is None:
+        st = struct_cache[fmt] = struct.Struct(fmt)
+    return st
+
+def get_slots_state(obj):
+    """
+    Return a dict of the slots set on obj
+
+    The generated classes use __slots__ and so have no __dict__. They use
+    this as __getstate__ (and set_slots_state as __setstate__) so they
+    can be pickled with every protocol.
+    """
+    state = {}
+    for klass in type(obj).__mro__:
+        for name in klass.__dict__.get('__slots__', ()):
+            try:
+                state[name] = getattr(obj, name)
+            except AttributeError:
+                pass
+    return state
+
+def set_slots_state(obj, state):
+    for name, value in state.items():
+        setattr(obj, name, value)
+
+# Lazily unpacked subclasses of the message classes, indexed by class
+lazy_classes = {}
+
+def unpack_lazy(cls, buf):
+    """
+    Return an instance of cls whose members are decoded from buf on first
+    access. buf must not be modified while the object is in use.
+
+    cls must have a _lazy_steps dict giving the unpack step that decodes
+    each member and a static method _unpack_step(obj, reader, step). See
+    make_lazy_class.
+    """
+    lazy_cls = lazy_classes.get(cls)
+    if lazy_cls is None:
+        lazy_cls = lazy_classes[cls] = make_lazy_class(cls)
+    obj = lazy_cls.__new__(lazy_cls)
+    obj._lazy = [OFReader(buf), 0]
+    return obj
+
+def make_lazy_class(cls):
+    """
+    Create the subclass of cls used for lazily unpacked objects
+
+    Reading a member decodes the unpack steps up to the one that sets it.
+    Assigning a member, comparing, copying or pickling the object decodes
+    all of them. Once every step has been decoded the object becomes a
+    plain instance of cls and no longer references the buffer.
+    """
+    steps = cls._lazy_steps
+    last_step = max(steps.values())
+
+    def decode(obj, step):
+        lazy = obj._lazy
+        reader = lazy[0]
+        # The steps assign the members of a plain instance
+        obj.__class__ = cls
+        try:
+            while lazy[1] <= step:
+                # A step that fails is retried (and fails again) on the
+                # next access, so rewind the reader to where it started
+                offset = reader.offset
+                try:
+                    cls._unpack_step(obj, reader, lazy[1])
+                except:
+                    reader.offset = offset
+                    raise
+                lazy[1] += 1
+        finally:
+            if lazy[1] <= last_step:
+                obj.__class__ = lazy_cls
+            else:
+                del obj._lazy
+
+    class lazy_cls(cls):
+        __slots__ = []
+
+        def __getattr__(self, name):
+            step = steps.get(name)
+            if step is None:
+                raise AttributeError(name)
+            decode(self, step)
+            return object.__getattribute__(self, name)
+
+        def __setattr__(self, name, value):
+            if name in steps:
+                decode(self, last_step)
+            object.__setattr__(self, name, value)
+
+        def __eq__(self, other):
+            decode(self, last_step)
+            return self == other
+
+        def __reduce_ex__(self, protocol):
+            # Copy or pickle the decoded object, not the buffer
+            decode(self, last_step)
+            return self.__reduce_ex__(protocol)
+
+    lazy_cls.__name__ = cls.__name__
+    lazy_cls.__module__ = cls.__module__
+    return lazy_cls
+
 def unpack_list(reader, deserializer):
     """
     The deserializer function should take an OFReader and return the new object.
@@ -63,6 +177,21 @@ def unpack_list_tlv16(reader, deserializer):
         return deserializer(reader.slice(length), typ)
     return unpack_list(reader, wrapper)
 
+class OFWriter(bytearray):
+    """
+    Growable buffer that objects are serialized into
+
+    The pack_into() methods of the generated classes append their members,
+    and those of their child objects, directly to the writer, which is a
+    bytearray. A length field that depends on the data following it is
+    packed as 0 along with the fixed size members around it; once the
+    length is known the generated code overwrites it in place with
+    struct.pack_into(). str() returns the serialized data.
+    """
+    def write_list(self, objs):
+        for obj in objs:
+            obj.pack_into(self)
+
 class OFReader(object):
     """
     Cursor over a read-only buffer
@@ -72,13 +201,22 @@ class OFReader(object):
     known field lengths. This class supports efficiently reading
     fields sequentially and is intended to be used recursively by the
     parsers of child objects which will implicitly update the offset.
+
+    The buffer is accessed through a memoryview, so slice() and read_all()
+    return views of it without copying. Use tobytes() on the result of
+    read_all() to get a string that owns its data.
     """
     def __init__(self, buf):
-        self.buf = buf
+        self.buf = memoryview(buf)
         self.offset = 0
 
     def read(self, fmt):
-        st = struct.Struct(fmt)
+        return self.read_struct(get_struct(fmt))
+
+    def read_struct(self, st):
+        """
+        Read the fields of the precompiled struct.Struct st
+        """
         if self.offset + st.size > len(self.buf):
             raise loxi.ProtocolError("Buffer too short")
         result = st.unpack_from(self.buf, self.offset)
@@ -86,12 +224,12 @@ class OFReader(object):
         return result
 
     def read_all(self):
-        buf = buffer(self.buf, self.offset)
+        buf = self.buf[self.offset:]
         self.offset += len(buf)
-        return str(buf)
+        return buf
 
     def peek(self, fmt):
-        st = struct.Struct(fmt)
+        st = get_struct(fmt)
         if self.offset + st.size > len(self.buf):
             raise loxi.ProtocolError("Buffer too short")
         result = st.unpack_from(self.buf, self.offset)
@@ -110,6 +248,6 @@ class OFReader(object):
     def slice(self, length):
         if self.offset + length > len(self.buf):
             raise loxi.ProtocolError("Buffer too short")
-        buf = OFReader(buffer(self.buf, self.offset, length))
+        buf = OFReader(self.buf[self.offset:self.offset+length])
         self.offset += length
         return buf
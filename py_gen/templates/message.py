@@ -46,15 +46,20 @@ import util
 import loxi.generic_util
 
 class Message(object):
+    __slots__ = ['xid', '_lazy']
     version = const.OFP_VERSION
     type = None # override in subclass
-    xid = None
+    __getstate__ = loxi.generic_util.get_slots_state
+    __setstate__ = loxi.generic_util.set_slots_state
 
 :: for ofclass in ofclasses:
 :: from py_gen.codegen import Member, LengthMember, TypeMember
 :: normal_members = [m for m in ofclass.members if type(m) == Member]
 :: type_members = [m for m in ofclass.members if type(m) == TypeMember]
+:: include('_pack_structs.py', ofclass=ofclass)
+:: from py_gen.codegen import unpack_steps
 class ${ofclass.pyname}(Message):
+    __slots__ = [${', '.join([repr(m.name) for m in normal_members if m.name != 'xid'])}]
 :: for m in type_members:
     ${m.name} = ${m.value}
 :: #endfor
@@ -68,18 +73,29 @@ class ${ofclass.pyname}(Message):
             self.${m.name} = ${m.oftype.gen_init_expr()}
 :: #endfor
 
-    def pack(self):
-        packed = []
 :: include('_pack.py', ofclass=ofclass)
-        return ''.join(packed)
 
     @staticmethod
-    def unpack(buf):
+    def unpack(buf, lazy=False):
         if len(buf) < 8: raise loxi.ProtocolError("buffer too short to contain an OpenFlow message")
+        if lazy:
+            return loxi.generic_util.unpack_lazy(${ofclass.pyname}, buf)
         obj = ${ofclass.pyname}()
 :: include('_unpack.py', ofclass=ofclass)
         return obj
 
+:: steps = unpack_steps(ofclass)
+    _lazy_steps = {${', '.join(["'%s': %d" % (name, i) for (i, (members, stmts)) in enumerate(steps) for name in members])}}
+
+    @staticmethod
+    def _unpack_step(obj, reader, step):
+:: for (i, (members, stmts)) in enumerate(steps):
+        ${i == 0 and "if" or "elif"} step == ${i}:
+::     for stmt in stmts:
+            ${stmt}
+::     #endfor
+:: #endfor
+
     def __eq__(self, other):
         if type(self) != type(other): return False
         if self.version != other.version: return False
@@ -109,69 +125,75 @@ def parse_header(buf):
         raise loxi.ProtocolError("too short to be an OpenFlow message")
     return struct.unpack_from("!BBHL", buf)
 
-def parse_message(buf):
+def parse_message(buf, lazy=False):
+    """
+    Unpack the OpenFlow message in buf
+
+    If lazy is true the members of the message are only decoded from buf
+    when first accessed.
+    """
     msg_ver, msg_type, msg_len, msg_xid = parse_header(buf)
     if msg_ver != const.OFP_VERSION and msg_type != ofp.OFPT_HELLO:
         raise loxi.ProtocolError("wrong OpenFlow version")
     if len(buf) != msg_len:
         raise loxi.ProtocolError("incorrect message size")
     if msg_type in parsers:
-        return parsers[msg_type](buf)
+        return parsers[msg_type](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected message type")
 
 :: # TODO fix for OF 1.1+
-def parse_flow_mod(buf):
+def parse_flow_mod(buf, lazy=False):
     if len(buf) < 56 + 2:
         raise loxi.ProtocolError("message too short")
     cmd, = struct.unpack_from("!H", buf, 56)
     if cmd in flow_mod_parsers:
-        return flow_mod_parsers[cmd](buf)
+        return flow_mod_parsers[cmd](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected flow mod cmd %u" % cmd)
 
 :: if version < of_g.VERSION_1_3:
-def parse_stats_reply(buf):
+def parse_stats_reply(buf, lazy=False):
     if len(buf) < 8 + 2:
         raise loxi.ProtocolError("message too short")
     stats_type, = struct.unpack_from("!H", buf, 8)
     if stats_type in stats_reply_parsers:
-        return stats_reply_parsers[stats_type](buf)
+        return stats_reply_parsers[stats_type](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected stats type %u" % stats_type)
 
-def parse_stats_request(buf):
+def parse_stats_request(buf, lazy=False):
     if len(buf) < 8 + 2:
         raise loxi.ProtocolError("message too short")
     stats_type, = struct.unpack_from("!H", buf, 8)
     if stats_type in stats_request_parsers:
-        return stats_request_parsers[stats_type](buf)
+        return stats_request_parsers[stats_type](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected stats type %u" % stats_type)
 :: else:
-def parse_multipart_reply(buf):
+def parse_multipart_reply(buf, lazy=False):
     if len(buf) < 8 + 2:
         raise loxi.ProtocolError("message too short")
     multipart_type, = struct.unpack_from("!H", buf, 8)
     if multipart_type in multipart_reply_parsers:
-        return multipart_reply_parsers[multipart_type](buf)
+        return multipart_reply_parsers[multipart_type](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected multipart type %u" % multipart_type)
 
-def parse_multipart_request(buf):
+def parse_multipart_request(buf, lazy=False):
     if len(buf) < 8 + 2:
         raise loxi.ProtocolError("message too short")
     multipart_type, = struct.unpack_from("!H", buf, 8)
     if multipart_type in multipart_request_parsers:
-        return multipart_request_parsers[multipart_type](buf)
+        return multipart_request_parsers[multipart_type](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected multipart type %u" % multipart_type)
 :: #endif
 
 :: if version == of_g.VERSION_1_0:
-def parse_vendor(buf):
+def parse_vendor(buf, lazy=False):
 :: else:
-def parse_experimenter(buf):
+def parse_experimenter(buf, lazy=False):
 :: #endif
     if len(buf) < 16:
         raise loxi.ProtocolError("experimenter message too short")
@@ -185,7 +207,7 @@ def parse_experimenter(buf):
         raise loxi.ProtocolError("unexpected experimenter id %#x" % experimenter)
 
     if subtype in experimenter_parsers[experimenter]:
-        return experimenter_parsers[experimenter][subtype](buf)
+        return experimenter_parsers[experimenter][subtype](buf, lazy)
     else:
         raise loxi.ProtocolError("unexpected experimenter %#x subtype %#x" % (experimenter, subtype))
 
@@ -211,46 +233,34 @@ flow_mod_parsers = {
 }
 
 :: if version < of_g.VERSION_1_3:
-stats_reply_parsers = {
-    const.OFPST_DESC : desc_stats_reply.unpack,
-    const.OFPST_FLOW : flow_stats_reply.unpack,
-    const.OFPST_AGGREGATE : aggregate_stats_reply.unpack,
-    const.OFPST_TABLE : table_stats_reply.unpack,
-    const.OFPST_PORT : port_stats_reply.unpack,
-    const.OFPST_QUEUE : queue_stats_reply.unpack,
+:: pynames = set(x.pyname for x in ofclasses)
+:: stats_types = [("DESC", "desc"), ("FLOW", "flow"), ("AGGREGATE", "aggregate"),
+::                ("TABLE", "table"), ("PORT", "port"), ("QUEUE", "queue")]
 :: if version < of_g.VERSION_1_1:
-    const.OFPST_VENDOR : experimenter_stats_reply.unpack,
+:: stats_types.append(("VENDOR", "experimenter"))
 :: else:
-    const.OFPST_EXPERIMENTER : experimenter_stats_reply.unpack,
+:: stats_types.append(("EXPERIMENTER", "experimenter"))
 :: #endif
 :: if version >= of_g.VERSION_1_1:
-    const.OFPST_GROUP : group_stats_reply.unpack,
-    const.OFPST_GROUP_DESC : group_desc_stats_reply.unpack,
+:: stats_types += [("GROUP", "group"), ("GROUP_DESC", "group_desc")]
 :: #endif
 :: if version >= of_g.VERSION_1_2:
-    const.OFPST_GROUP_FEATURES : group_features_stats_reply.unpack,
+:: stats_types.append(("GROUP_FEATURES", "group_features"))
+:: #endif
+stats_reply_parsers = {
+:: for (stats_type, name) in stats_types:
+:: if name + "_stats_reply" in pynames:
+    const.OFPST_${stats_type} : ${name}_stats_reply.unpack,
 :: #endif
+:: #endfor
 }
 
 stats_request_parsers = {
-    const.OFPST_DESC : desc_stats_request.unpack,
-    const.OFPST_FLOW : flow_stats_request.unpack,
-    const.OFPST_AGGREGATE : aggregate_stats_request.unpack,
-    const.OFPST_TABLE : table_stats_request.unpack,
-    const.OFPST_PORT : port_stats_request.unpack,
-    const.OFPST_QUEUE : queue_stats_request.unpack,
-:: if version < of_g.VERSION_1_1:
-    const.OFPST_VENDOR : experimenter_stats_request.unpack,
-:: else:
-    const.OFPST_EXPERIMENTER : experimenter_stats_request.unpack,
-:: #endif
-:: if version >= of_g.VERSION_1_1:
-    const.OFPST_GROUP : group_stats_request.unpack,
-    const.OFPST_GROUP_DESC : group_desc_stats_request.unpack,
-:: #endif
-:: if version >= of_g.VERSION_1_2:
-    const.OFPST_GROUP_FEATURES : group_features_stats_request.unpack,
+:: for (stats_type, name) in stats_types:
+:: if name + "_stats_request" in pynames:
+    const.OFPST_${stats_type} : ${name}_stats_request.unpack,
 :: #endif
+:: #endfor
 }
 :: else:
 # TODO OF 1.3 multipart messages
@@ -48,14 +48,18 @@ def unpack_list(reader):
     return loxi.generic_util.unpack_list(reader, deserializer)
 
 class OXM(object):
+    __slots__ = []
     type_len = None # override in subclass
-    pass
+    __getstate__ = loxi.generic_util.get_slots_state
+    __setstate__ = loxi.generic_util.set_slots_state
 
 :: for ofclass in ofclasses:
 :: from py_gen.codegen import Member, LengthMember, TypeMember
 :: normal_members = [m for m in ofclass.members if type(m) == Member]
 :: type_members = [m for m in ofclass.members if type(m) == TypeMember]
+:: include("_pack_structs.py", ofclass=ofclass)
 class ${ofclass.pyname}(OXM):
+    __slots__ = [${', '.join([repr(m.name) for m in normal_members])}]
 :: for m in type_members:
     ${m.name} = ${m.value}
 :: #endfor
@@ -68,10 +72,7 @@ class ${ofclass.pyname}(OXM):
             self.${m.name} = ${m.oftype.gen_init_expr()}
 :: #endfor
 
-    def pack(self):
-        packed = []
 :: include("_pack.py", ofclass=ofclass)
-        return ''.join(packed)
 
     @staticmethod
     def unpack(buf):
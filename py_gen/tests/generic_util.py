@@ -25,6 +25,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # EPL for the specific language governing permissions and limitations
 # under the EPL.
+import struct
 import unittest
 
 try:
@@ -52,6 +53,17 @@ class TestUnpackListLV16(unittest.TestCase):
         a = loxi.generic_util.unpack_list_lv16(reader, deserializer)
         self.assertEquals(['abc', 'de', 'f', ''], a)
 
+class TestOFWriter(unittest.TestCase):
+    def test_write_list(self):
+        class Obj(object):
+            def __init__(self, data):
+                self.data = data
+            def pack_into(self, writer):
+                writer += self.data
+        writer = loxi.generic_util.OFWriter()
+        writer.write_list([Obj("ab"), Obj(""), Obj("c")])
+        self.assertEquals(str(writer), "abc")
+
 class TestOFReader(unittest.TestCase):
     def test_empty(self):
         reader = OFReader("")
@@ -103,6 +115,14 @@ class TestOFReader(unittest.TestCase):
         with self.assertRaisesRegexp(loxi.ProtocolError, "Buffer too short"):
             reader.peek('s')
 
+    def test_read_struct(self):
+        reader = OFReader("\x01\x00\x02abc")
+        st = struct.Struct("!BHs")
+        self.assertEquals(reader.read_struct(st), (1, 2, "a"))
+        with self.assertRaisesRegexp(loxi.ProtocolError, "Buffer too short"):
+            reader.read_struct(st)
+        self.assertEquals(reader.read_all(), "bc")
+
     def test_read_all(self):
         reader = OFReader("abcdefg")
         reader.skip(2)
@@ -116,5 +136,21 @@ class TestOFReader(unittest.TestCase):
         self.assertEquals(reader.slice(2).read_all(), "fg")
         self.assertEquals(reader.is_empty(), True)
 
+    def test_zero_copy(self):
+        buf = bytearray("abcdefg")
+        reader = OFReader(buf)
+        reader.skip(2)
+        data = reader.slice(3).read_all()
+        rest = reader.read_all()
+        buf[2] = "x"
+        buf[6] = "y"
+        self.assertEquals(data.tobytes(), "xde")
+        self.assertEquals(rest.tobytes(), "fy")
+
+    def test_get_struct(self):
+        st = loxi.generic_util.get_struct("!HL")
+        self.assertEquals(st.format, "!HL")
+        self.assertIs(loxi.generic_util.get_struct("!HL"), st)
+
 if __name__ == '__main__':
     unittest.main()
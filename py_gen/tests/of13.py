@@ -27,10 +27,12 @@
 # under the EPL.
 import unittest
 import difflib
+import copy
+import pickle
 
 try:
     import loxi.of13 as ofp
-    from loxi.generic_util import OFReader
+    from loxi.generic_util import OFReader, OFWriter
 except ImportError:
     exit("loxi package not found. Try setting PYTHONPATH.")
 
@@ -449,6 +451,12 @@ class TestMessages(unittest.TestCase):
         ])
         test_serialization(obj, buf)
 
+        # The length fields are patched relative to the start of the object
+        writer = OFWriter("prefix")
+        obj.pack_into(writer)
+        obj.pack_into(writer)
+        self.assertEquals(str(writer), "prefix" + buf + buf)
+
     def test_flow_modify(self):
         # TODO
         pass
@@ -969,6 +977,68 @@ class TestInstructions(unittest.TestCase):
 
     # TODO test experimenter instructions
 
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.msg = ofp.message.packet_in(
+            xid=0x12345678,
+            buffer_id=100,
+            total_len=17000,
+            reason=ofp.OFPR_ACTION,
+            table_id=20,
+            cookie=0xFEDCBA9876543210,
+            match=ofp.match(oxm_list=[ofp.oxm.in_port(4)]),
+            data="abc")
+        self.buf = self.msg.pack()
+
+    def test_access(self):
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        self.assertIsInstance(obj, ofp.message.packet_in)
+        self.assertEquals(obj.cookie, 0xFEDCBA9876543210)
+        self.assertEquals(obj.reason, ofp.OFPR_ACTION)
+        self.assertEquals(obj.match, self.msg.match)
+        self.assertNotEquals(type(obj), ofp.message.packet_in)
+        self.assertEquals(obj.data, "abc")
+        self.assertEquals(type(obj), ofp.message.packet_in)
+        self.assertEquals(obj, self.msg)
+
+    def test_modify(self):
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        obj.cookie = 5
+        self.assertEquals(type(obj), ofp.message.packet_in)
+        self.assertEquals(obj.cookie, 5)
+        self.assertEquals(obj.data, "abc")
+
+    def test_eq(self):
+        self.assertEquals(ofp.message.parse_message(self.buf, lazy=True), self.msg)
+        self.assertEquals(self.msg, ofp.message.parse_message(self.buf, lazy=True))
+        self.assertNotEquals(self.msg, ofp.message.parse_message(self.buf[:-1] + "d", lazy=True))
+
+    def test_pack(self):
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        self.assertEquals(obj.pack(), self.buf)
+
+    def test_copy(self):
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        self.assertEquals(copy.copy(obj), self.msg)
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        self.assertEquals(copy.deepcopy(obj), self.msg)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            obj = ofp.message.parse_message(self.buf, lazy=True)
+            self.assertEquals(pickle.loads(pickle.dumps(obj, protocol)), self.msg)
+        self.assertEquals(type(obj), ofp.message.packet_in)
+
+    def test_repr(self):
+        obj = ofp.message.parse_message(self.buf, lazy=True)
+        self.assertTrue(repr(obj).startswith("<loxi.of13.message.packet_in "))
+
+    def test_truncated(self):
+        msg = ofp.message.flow_add(xid=1, priority=5, match=ofp.match(oxm_list=[ofp.oxm.in_port(4)]))
+        obj = ofp.message.flow_add.unpack(msg.pack()[:60], lazy=True)
+        self.assertEquals(obj.priority, msg.priority)
+        self.assertRaises(ofp.ProtocolError, lambda: obj.match)
+        self.assertRaises(ofp.ProtocolError, lambda: obj.match)
+        self.assertRaises(AttributeError, lambda: obj.foo)
+
 class TestAllOF13(unittest.TestCase):
     """
     Round-trips every class through serialization/deserialization.
@@ -1005,6 +1075,13 @@ class TestAllOF13(unittest.TestCase):
             else:
                 fn()
 
+    def test_slots(self):
+        for klass in self.klasses:
+            obj = klass()
+            self.assertFalse(hasattr(obj, "__dict__"), klass)
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                self.assertEquals(pickle.loads(pickle.dumps(obj, protocol)), obj)
+
     def test_show(self):
         expected_failures = []
         for klass in self.klasses:
@@ -74,6 +74,7 @@ def primary_wire_type(cls, version):
         raise ValueError("No wiretype for %s in version %d" % (cls, version))
 
 def constant_for_value(version, group, value):
-    return (["const." + v["ofp_name"] for k, v in of_g.identifiers.items()
-             if k in of_g.identifiers_by_group[group] and
-                v["values_by_version"].get(version, None) == value] or [value])[0]
+    ofp_name = of_g.identifiers_by_value.get((group, version, value))
+    if ofp_name is None:
+        return value
+    return "const." + ofp_name
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+
+"""
+Time full generator runs and compare them with a saved baseline
+
+Usage: utest/benchmark_generator.py [options]
+
+For each language a cold run (empty front end and template caches and
+output directory) and a warm run (reusing them, with --write-if-changed)
+are timed.  The front end is also timed on its own (loxigen
+--frontend-only), cold and warm from its cache.  The C backend is also
+run on a synthetic input set in which each extension input file is
+repeated --scale times under new class names, to expose behavior that
+is superlinear in the number of classes.  The Python and Java backends
+need type_maps entries for each extension class, so they are not run on
+the synthetic input.
+
+Each run is repeated --iterations times and the best result is kept: the
+wall time, the peak RSS and the time taken by each target, as reported
+by loxigen --profile.
+
+With --save-baseline the results are written to the baseline file.
+Otherwise they are compared with it and the exit status is 1 if any
+measurement regressed by more than --threshold percent and by more than
+--min-seconds (or --min-kb for the peak RSS, and min_target_change_seconds
+for a single target), or if a run that succeeded in the baseline now
+fails.
+
+The timings depend on the machine, so no baseline is committed: save one
+on the machine the comparisons will be run on ("make bench-baseline")
+before making the changes to be measured.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+from optparse import OptionParser
+
+root_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+
+##
+# Targets faster than this in the baseline are not compared, since their
+# timings are mostly noise
+min_target_seconds = 0.05
+
+##
+# The smallest increase in the time of a single target counted as a
+# regression.  --min-seconds is meant for whole runs and is larger than
+# the time taken by any target.
+min_target_change_seconds = 0.02
+
+class RunError(Exception):
+    pass
+
+def make_synthetic_input(input_dir, scale):
+    """
+    Fill input_dir with the openflow_input files and scale - 1 copies of
+    each file that only declares extension classes, with the struct names
+    suffixed to make them unique
+    """
+    for filename in sorted(glob.glob(os.path.join(root_dir, 'openflow_input', '*'))):
+        shutil.copy(filename, input_dir)
+        src = open(filename).read()
+        names = re.findall(r"^struct ofp_(\w+)", src, re.M)
+        if not names or \
+                [x for x in names if not re.match(r"(action_)?(bsn|nicira)_", x)]:
+            continue
+        for i in range(2, scale + 1):
+            copy = re.sub(r"^struct ofp_(\w+)", r"struct ofp_\1_s%d" % i,
+                          src, flags=re.M)
+            name = "%s_s%d" % (os.path.basename(filename), i)
+            with open(os.path.join(input_dir, name), "w") as f:
+                f.write(copy)
+
+def run_loxigen(lang, work_dir, input_dir, frontend_only):
+    """
+    Run loxigen once in work_dir and return its measurements
+
+    The caches and output directory are kept in work_dir, so a second
+    run with the same work_dir is a warm run.
+    """
+    profile_output = os.path.join(work_dir, "profile.json")
+    args = [sys.executable, os.path.join(root_dir, "loxigen.py"),
+            "--lang=" + lang,
+            "--install-dir=" + os.path.join(work_dir, "output"),
+            "--cache-dir=" + os.path.join(work_dir, "cache"),
+            "--template-cache-dir=" + os.path.join(work_dir, "cache", "templates"),
+            "--write-if-changed", "--profile",
+            "--profile-output=" + profile_output]
+    if input_dir:
+        args.append("--input-dir=" + input_dir)
+    if frontend_only:
+        args.append("--frontend-only")
+    start = time.time()
+    proc = subprocess.Popen(args, cwd=work_dir, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT)
+    output = proc.communicate()[0]
+    seconds = time.time() - start
+    if proc.returncode != 0:
+        lines = output.strip().splitlines()
+        raise RunError(lines and lines[-1] or "exit status %d" % proc.returncode)
+    with open(profile_output) as f:
+        profile = json.load(f)
+    return dict(seconds=seconds,
+                peak_rss_kb=max(profile["peak_rss_kb"],
+                                profile["peak_worker_rss_kb"]),
+                targets=dict([(x["name"], x["seconds"])
+                              for x in profile["targets"]]))
+
+def best(runs):
+    """
+    Combine the measurements of repeated runs, keeping the lowest of each
+    """
+    result = dict([(key, min([run[key] for run in runs]))
+                   for key in ["seconds", "peak_rss_kb"]])
+    result["targets"] = dict([(name, min([run["targets"][name] for run in runs]))
+                              for name in runs[0]["targets"]])
+    return result
+
+def benchmark(lang, input_dir, frontend_only, iterations):
+    """
+    Return the best (cold, warm) measurements for lang
+    """
+    cold = []
+    warm = []
+    for i in range(iterations):
+        work_dir = tempfile.mkdtemp(prefix="loxigen-benchmark-")
+        try:
+            cold.append(run_loxigen(lang, work_dir, input_dir, frontend_only))
+            warm.append(run_loxigen(lang, work_dir, input_dir, frontend_only))
+        finally:
+            shutil.rmtree(work_dir)
+    return best(cold), best(warm)
+
+def compare(result, baseline, threshold, min_seconds, min_kb):
+    """
+    Return a list of the measurements of result that regressed by more
+    than threshold percent compared to baseline
+
+    Changes of less than min_seconds (min_kb for the peak RSS,
+    min_target_change_seconds for a target) are noise, however large
+    they are relative to a short baseline.
+    """
+    if "error" in baseline:
+        return []
+    if "error" in result:
+        return ["failed: %s" % result["error"]]
+    measurements = [("seconds", result["seconds"], baseline["seconds"],
+                     min_seconds),
+                    ("peak_rss_kb", result["peak_rss_kb"],
+                     baseline["peak_rss_kb"], min_kb)]
+    for name, seconds in sorted(result["targets"].items()):
+        base = baseline["targets"].get(name)
+        if base is not None and base >= min_target_seconds:
+            measurements.append(("target " + name, seconds, base,
+                                 min_target_change_seconds))
+    regressions = []
+    for what, value, base, noise in measurements:
+        if base and value > base * (1 + threshold / 100.0) and \
+                value - base > noise:
+            regressions.append("%s %g -> %g (+%.0f%%)" %
+                               (what, base, value, 100.0 * (value - base) / base))
+    return regressions
+
+def report(name, result, baseline):
+    if "error" in result:
+        print "%-16s failed: %s" % (name, result["error"])
+        return
+    change = ""
+    if baseline and "error" not in baseline:
+        change = "%+6.1f%%" % (100.0 * (result["seconds"] - baseline["seconds"]) /
+                               baseline["seconds"])
+    print "%-16s %9.3f %10d %8s" % (name, result["seconds"],
+                                    result["peak_rss_kb"], change)
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--lang", default="c,python,java",
+                      help="Comma separated languages to benchmark (default %default)")
+    parser.add_option("--iterations", type="int", default=3,
+                      help="Runs of each benchmark, the best is kept (default %default)")
+    parser.add_option("--scale", type="int", default=10,
+                      help="Copies of each extension file in the synthetic input (default %default)")
+    parser.add_option("--baseline", default="loxigen-benchmark-baseline.json",
+                      help="Baseline file (default %default)")
+    parser.add_option("--save-baseline", action="store_true", default=False,
+                      help="Save the results as the new baseline instead of comparing")
+    parser.add_option("--threshold", type="float", default=20.0,
+                      help="Percentage by which a measurement may exceed the baseline (default %default)")
+    parser.add_option("--min-seconds", type="float", default=0.25,
+                      help="Smallest increase in seconds counted as a regression (default %default)")
+    parser.add_option("--min-kb", type="int", default=4096,
+                      help="Smallest increase in peak RSS counted as a regression (default %default)")
+    (options, args) = parser.parse_args()
+
+    baseline = {}
+    if not options.save_baseline:
+        if os.path.exists(options.baseline):
+            with open(options.baseline) as f:
+                baseline = json.load(f)
+        else:
+            print "No baseline %s, run with --save-baseline to create it" % \
+                options.baseline
+
+    synthetic_dir = tempfile.mkdtemp(prefix="loxigen-benchmark-input-")
+    try:
+        make_synthetic_input(synthetic_dir, options.scale)
+        langs = options.lang.split(",")
+        benchmarks = [("frontend", langs[0], None, True)]
+        benchmarks += [(lang, lang, None, False) for lang in langs]
+        if "c" in langs:
+            benchmarks.append(("c-x%d" % options.scale, "c", synthetic_dir, False))
+
+        print "%-16s %9s %10s %8s" % ("benchmark", "seconds", "peak KB", "change")
+        results = {}
+        for name, lang, input_dir, frontend_only in benchmarks:
+            try:
+                cold, warm = benchmark(lang, input_dir, frontend_only,
+                                       options.iterations)
+            except RunError, e:
+                cold = warm = dict(error=str(e))
+            for kind, result in [("cold", cold), ("warm", warm)]:
+                key = "%s/%s" % (name, kind)
+                results[key] = result
+                report(key, result, baseline.get(key))
+    finally:
+        shutil.rmtree(synthetic_dir)
+
+    print "\nSlowest targets (cold runs):"
+    slowest = [(seconds, key.split("/")[0] + ":" + target)
+               for key, result in results.items()
+               if key.endswith("/cold") and "error" not in result
+               for target, seconds in result["targets"].items()]
+    for seconds, name in sorted(slowest, reverse=True)[:10]:
+        print "  %8.3f %s" % (seconds, name)
+
+    if options.save_baseline:
+        with open(options.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print "\nWrote baseline to %s" % options.baseline
+        return
+
+    failed = False
+    for key in sorted(results):
+        if key in baseline:
+            for regression in compare(results[key], baseline[key],
+                                      options.threshold, options.min_seconds,
+                                      options.min_kb):
+                print "REGRESSION %s: %s" % (key, regression)
+                failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+
+"""
+Time the input file parsers on the full set of openflow_input files
+
+Usage: PYTHONPATH=. utest/benchmark_parser.py [iterations]
+"""
+
+import os
+import sys
+import glob
+import time
+import loxi_front_end.parser as parser
+import loxi_front_end.fast_parser as fast_parser
+
+root_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+
+parsers = [
+    ("pyparsing", lambda src: parser.parse(src).asList()),
+    ("fast", fast_parser.parse),
+]
+
+def main():
+    iterations = len(sys.argv) > 1 and int(sys.argv[1]) or 5
+    filenames = sorted(glob.glob(os.path.join(root_dir, 'openflow_input', '*')))
+    sources = [open(filename).read() for filename in filenames]
+    print "%d files, %d lines, %d iterations" % \
+        (len(sources), sum([src.count("\n") for src in sources]), iterations)
+
+    results = {}
+    for name, parse in parsers:
+        best = None
+        for i in range(iterations):
+            start = time.time()
+            asts = [parse(src) for src in sources]
+            elapsed = time.time() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        results[name] = asts
+        print "%-10s %8.1f ms" % (name, best * 1000)
+
+    if results["fast"] != results["pyparsing"]:
+        print "ERROR: parsers produced different results"
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+"""
+Generates LOCI for a subset of the classes with --classes and
+--exclude-classes and checks the generated type tables
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_type_tables(filename):
+    """
+    Return the of_*_type_to_id_v* tables of of_type_data.c as a dict of
+    lists of object ids
+    """
+    tables = {}
+    text = open(filename).read()
+    for name, body in re.findall(r"\n(of_\w+_type_to_id_v\d)\[\w+\] = \{(.*?)\};",
+                                 text, re.S):
+        tables[name] = re.findall(r"(OF_\w+)", body)
+    return tables
+
+class ClassFilterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def generate(self, *args):
+        install_dir = os.path.join(self.tmp_dir, "out")
+        cmd = [sys.executable, os.path.join(root_dir, "loxigen.py"), "--lang=c",
+               "--install-dir=" + install_dir,
+               "--cache-dir=" + os.path.join(self.tmp_dir, "cache")] + list(args)
+        with open(os.path.join(self.tmp_dir, "loxigen.out"), "w") as out:
+            subprocess.check_call(cmd, cwd=self.tmp_dir, stdout=out, stderr=out)
+        return install_dir
+
+    def test_classes(self):
+        install_dir = self.generate(
+            "--classes=of_packet_in,of_flow_removed,of_echo_*,actions")
+        tables = parse_type_tables(
+            os.path.join(install_dir, "loci", "src", "of_type_data.c"))
+        for version in range(1, 5):
+            self.assertIn("OF_ACTION_OUTPUT",
+                          tables["of_action_type_to_id_v%d" % version])
+        # The OF 1.3 action and action_id type tables share their source,
+        # pruning the action_id classes must not empty the action table
+        self.assertIn("OF_ACTION_SET_FIELD", tables["of_action_type_to_id_v4"])
+        self.assertEquals(set(tables["of_action_id_type_to_id_v4"]),
+                          set(["OF_OBJECT_INVALID"]))
+        self.assertEquals(set(tables["of_instruction_type_to_id_v4"]),
+                          set(["OF_OBJECT_INVALID"]))
+
+    def test_exclude_classes(self):
+        install_dir = self.generate("--exclude-classes=of_bsn_*")
+        filename = os.path.join(install_dir, "loci", "src", "of_type_data.c")
+        tables = parse_type_tables(filename)
+        self.assertIn("OF_ACTION_OUTPUT", tables["of_action_type_to_id_v4"])
+        self.assertIn("OF_ACTION_ID_OUTPUT", tables["of_action_id_type_to_id_v4"])
+        self.assertNotIn("OF_BSN_", open(filename).read())
+
+if __name__ == '__main__':
+    unittest.main()
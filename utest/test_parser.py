@@ -26,17 +26,38 @@
 # EPL for the specific language governing permissions and limitations
 # under the EPL.
 
+import os
+import glob
 import unittest
 import pyparsing
 import loxi_front_end.parser as parser
+import loxi_front_end.fast_parser as fast_parser
 
-class StructTests(unittest.TestCase):
+class ParserTestCase(unittest.TestCase):
+    """
+    Runs tests against the pyparsing grammar
+
+    Subclasses mixing in FastParserMixin run the same tests against the
+    hand-written parser.
+    """
+    parse_error = pyparsing.ParseSyntaxException
+
+    def parse(self, src):
+        return parser.parse(src).asList()
+
+class FastParserMixin(object):
+    parse_error = fast_parser.ParseError
+
+    def parse(self, src):
+        return fast_parser.parse(src)
+
+class StructTests(ParserTestCase):
     def test_empty(self):
         src = """\
 struct foo { };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['struct', 'foo', []]])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['struct', 'foo', []]])
 
     def test_one_field(self):
         src = """\
@@ -44,8 +65,8 @@ struct foo {
     uint32_t bar;
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo', [['uint32_t', 'bar']]]])
 
     def test_multiple_fields(self):
@@ -56,8 +77,8 @@ struct foo {
     uint64_t abc;
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo',
                 [['uint32_t', 'bar'],
                  ['uint8_t', 'baz'],
@@ -69,8 +90,8 @@ struct foo {
     uint32_t[4] bar;
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo', [['uint32_t[4]', 'bar']]]])
 
     def test_list_type(self):
@@ -79,18 +100,18 @@ struct foo {
     list(of_action_t) bar;
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo', [['list(of_action_t)', 'bar']]]])
 
-class EnumTests(unittest.TestCase):
+class EnumTests(ParserTestCase):
     def test_empty(self):
         src = """\
 enum foo {
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['enum', 'foo', []]])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['enum', 'foo', []]])
 
     def test_one(self):
         src = """\
@@ -98,8 +119,8 @@ enum foo {
     BAR = 1
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['enum', 'foo', [['BAR', 1]]]])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['enum', 'foo', [['BAR', 1]]]])
 
     def test_multiple(self):
         src = """\
@@ -109,8 +130,8 @@ enum foo {
     OFP_C = 3
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['enum', 'foo', [['OFP_A', 1], ['OFP_B', 2], ['OFP_C', 3]]]])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['enum', 'foo', [['OFP_A', 1], ['OFP_B', 2], ['OFP_C', 3]]]])
 
     def test_trailing_comma(self):
         src = """\
@@ -120,25 +141,25 @@ enum foo {
     OFP_C = 3,
 };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['enum', 'foo', [['OFP_A', 1], ['OFP_B', 2], ['OFP_C', 3]]]])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['enum', 'foo', [['OFP_A', 1], ['OFP_B', 2], ['OFP_C', 3]]]])
 
-class TestMetadata(unittest.TestCase):
+class TestMetadata(ParserTestCase):
     def test_version(self):
         src = """\
 #version 1
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(), [['metadata', 'version', '1']])
+        ast = self.parse(src)
+        self.assertEquals(ast, [['metadata', 'version', '1']])
 
-class TestToplevel(unittest.TestCase):
+class TestToplevel(ParserTestCase):
     def test_multiple_structs(self):
         src = """\
 struct foo { };
 struct bar { };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo', []], ['struct', 'bar', []]])
 
     def test_comments(self):
@@ -151,8 +172,8 @@ struct foo { //comment 2
 };
 // comment 4
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['struct', 'foo', [['uint32_t', 'a']]]])
 
     def test_mixed(self):
@@ -162,17 +183,17 @@ struct foo { };
 #version 2
 struct bar { };
 """
-        ast = parser.parse(src)
-        self.assertEquals(ast.asList(),
+        ast = self.parse(src)
+        self.assertEquals(ast,
             [['metadata', 'version', '1'],
              ['struct', 'foo', []],
              ['metadata', 'version', '2'],
              ['struct', 'bar', []]])
 
-class TestErrors(unittest.TestCase):
+class TestErrors(ParserTestCase):
     def syntax_error(self, src, regex):
-        with self.assertRaisesRegexp(pyparsing.ParseSyntaxException, regex):
-            parser.parse(src)
+        with self.assertRaisesRegexp(self.parse_error, regex):
+            self.parse(src)
 
     def test_missing_struct_syntax(self):
         self.syntax_error('struct { uint32_t bar; };',
@@ -196,6 +217,37 @@ class TestErrors(unittest.TestCase):
         self.syntax_error('struct foo { uint32_t bar baz; }',
                           'Expected ";" \(at char 26\)')
 
+class FastStructTests(FastParserMixin, StructTests):
+    pass
+
+class FastEnumTests(FastParserMixin, EnumTests):
+    pass
+
+class FastTestMetadata(FastParserMixin, TestMetadata):
+    pass
+
+class FastTestToplevel(FastParserMixin, TestToplevel):
+    pass
+
+class FastTestErrors(FastParserMixin, TestErrors):
+    def test_line_and_column(self):
+        src = """\
+struct foo {
+    uint32_t bar;
+    uint32_t baz
+};
+"""
+        with self.assertRaises(fast_parser.ParseError) as cm:
+            self.parse(src)
+        self.assertEquals((cm.exception.lineno, cm.exception.col), (4, 1))
+
+class TestInputFiles(unittest.TestCase):
+    def test_parsers_agree(self):
+        root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+        for filename in sorted(glob.glob(os.path.join(root, 'openflow_input', '*'))):
+            src = open(filename).read()
+            self.assertEquals(fast_parser.parse(src), parser.parse(src).asList(),
+                              "parsers disagree on %s" % filename)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# Copyright 2013, Big Switch Networks, Inc.
+#
+# LoxiGen is licensed under the Eclipse Public License, version 1.0 (EPL), with
+# the following special exception:
+#
+# LOXI Exception
+#
+# As a special exception to the terms of the EPL, you may distribute libraries
+# generated by LoxiGen (LoxiGen Libraries) under the terms of your choice, provided
+# that copyright and licensing notices generated by LoxiGen are not altered or removed
+# from the LoxiGen Libraries and the notice provided below is (i) included in
+# the LoxiGen Libraries, if distributed in source code form and (ii) included in any
+# documentation for the LoxiGen Libraries, if distributed in binary form.
+#
+# Notice: "Copyright 2013, Big Switch Networks, Inc. This library was generated by the LoxiGen Compiler."
+#
+# You may not use this file except in compliance with the EPL or LOXI Exception. You may obtain
+# a copy of the EPL at:
+#
+# http://www.eclipse.org/legal/epl-v10.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# EPL for the specific language governing permissions and limitations
+# under the EPL.
+
+"""
+Runs loxigen --watch and checks that it survives an input file with a
+syntax error
+"""
+
+import os
+import Queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds to wait for the watch process to react to a change
+timeout = 60
+
+class WatchTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.tmp_dir, "input")
+        shutil.copytree(os.path.join(root_dir, "openflow_input"), self.input_dir)
+        self.install_dir = os.path.join(self.tmp_dir, "out")
+        cmd = [sys.executable, "-u", os.path.join(root_dir, "loxigen.py"),
+               "--lang=python", "--watch", "--watch-interval=0.1",
+               "--input-dir=" + self.input_dir,
+               "--install-dir=" + self.install_dir]
+        self.proc = subprocess.Popen(cmd, cwd=self.tmp_dir,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT)
+        self.lines = Queue.Queue()
+        reader = threading.Thread(target=self.read_output)
+        reader.daemon = True
+        reader.start()
+
+    def tearDown(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        shutil.rmtree(self.tmp_dir)
+
+    def read_output(self):
+        for line in iter(self.proc.stdout.readline, ""):
+            self.lines.put(line.rstrip("\n"))
+        self.lines.put(None)
+
+    def wait_for(self, prefix):
+        """
+        Return the output lines up to and including the first one that
+        starts with prefix
+        """
+        lines = []
+        deadline = time.time() + timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0, deadline - time.time()))
+            except Queue.Empty:
+                self.fail("timed out waiting for %r" % prefix)
+            if line is None:
+                self.fail("loxigen exited waiting for %r:\n%s" %
+                          (prefix, "\n".join(lines)))
+            lines.append(line)
+            if line.startswith(prefix):
+                return lines
+
+    def write_input(self, name, contents):
+        filename = os.path.join(self.input_dir, name)
+        mtime = os.stat(filename).st_mtime
+        with open(filename, "w") as f:
+            f.write(contents)
+        # Make sure the change is seen even with a coarse mtime resolution
+        os.utime(filename, (mtime + 1, mtime + 1))
+
+    def test_syntax_error(self):
+        lines = self.wait_for("Watching for changes")
+        num_targets = len([x for x in lines if x.startswith("Wrote contents for ")])
+        self.assertTrue(num_targets > 0)
+        output = os.path.join(self.install_dir, "pyloxi", "loxi", "of10", "message.py")
+        contents = open(output).read()
+
+        original = open(os.path.join(self.input_dir, "nicira_role")).read()
+        self.write_input("nicira_role", original + "\nstruct ofp_broken {\n")
+        self.wait_for("Parse error in nicira_role")
+        self.wait_for("Keeping the previous outputs")
+        self.assertEquals(self.proc.poll(), None)
+        self.assertEquals(open(output).read(), contents)
+
+        self.write_input("nicira_role", original)
+        self.wait_for("Input files changed: nicira_role")
+        for i in range(num_targets):
+            self.wait_for("Contents unchanged for ")
+        self.assertEquals(self.proc.poll(), None)
+        self.assertEquals(open(output).read(), contents)
+
+if __name__ == '__main__':
+    unittest.main()